@@ -0,0 +1,309 @@
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from shop.models import (
+    AccessRule,
+    BusinessElement,
+    Cart,
+    CartItem,
+    Category,
+    Order,
+    OrderItem,
+    Product,
+    Role,
+    User,
+)
+from shop.serializers import order_totals
+from shop.utils.response_cache import bump_generation
+from shop.utils.sales_rollup import rebuild_rollups
+
+BENCHMARK_PASSWORD = "benchpass"
+
+BENCHMARK_EMAIL_DOMAIN = "bench.local"
+
+# Orders are dated back from this instant rather than from the current time
+# so the same seed always produces the same rows.
+REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+SCALES = {
+    "tiny": {
+        "customers": 3,
+        "categories": 2,
+        "products": 20,
+        "orders": 6,
+        "items_per_order": 3,
+        "carts": 3,
+    },
+    "small": {
+        "customers": 20,
+        "categories": 10,
+        "products": 2000,
+        "orders": 200,
+        "items_per_order": 5,
+        "carts": 20,
+    },
+    "medium": {
+        "customers": 200,
+        "categories": 50,
+        "products": 10000,
+        "orders": 5000,
+        "items_per_order": 10,
+        "carts": 200,
+    },
+    "large": {
+        "customers": 100000,
+        "categories": 1000,
+        "products": 1000000,
+        "orders": 10000000,
+        "items_per_order": 3,
+        "carts": 100000,
+    },
+}
+
+# role name -> business element -> AccessRule flags
+ROLE_RULES = {
+    "admin": {
+        element: {
+            "read_permission": True,
+            "read_all_permission": True,
+            "create_permission": True,
+            "can_create_for_other_users": True,
+            "update_permission": True,
+            "update_all_permission": True,
+            "delete_permission": True,
+            "delete_all_permission": True,
+        }
+        for element in ["Category", "Product", "Order", "Report"]
+    },
+    "manager": {
+        "Product": {
+            "read_permission": True,
+            "create_permission": True,
+            "update_permission": True,
+        },
+        "Order": {"read_permission": True, "read_all_permission": True},
+    },
+    "user": {
+        "Category": {"read_permission": True},
+        "Product": {"read_permission": True},
+        "Order": {
+            "read_permission": True,
+            "create_permission": True,
+            "update_permission": True,
+        },
+    },
+    "subscriber": {"Category": {"read_permission": True}},
+    "reviewer": {"Product": {"read_permission": True}},
+}
+
+# Customers carry several roles so permission checks OR masks together.
+CUSTOMER_ROLES = ["user", "subscriber", "reviewer"]
+
+
+def chunked_range(total, chunk_size):
+    for start in range(0, total, chunk_size):
+        yield range(start, min(start + chunk_size, total))
+
+
+class DataSeeder:
+    """
+    Generates a deterministic data set of arbitrary size with bulk_create.
+
+    Rows are written chunk_size at a time, each chunk in its own transaction,
+    so memory use does not grow with the number of orders; only product and
+    customer ids are kept. Every user shares one pre-computed password hash.
+    Orders are spread over the ``days`` days before ``now`` (REFERENCE_TIME
+    by default) and assigned to customers round-robin.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        chunk_size=10000,
+        password=BENCHMARK_PASSWORD,
+        email_domain=BENCHMARK_EMAIL_DOMAIN,
+        days=365,
+        now=REFERENCE_TIME,
+        progress=None,
+    ):
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.password_hash = make_password(password)
+        self.email_domain = email_domain
+        self.days = days
+        self.progress = progress or (lambda model, count: None)
+        self.now = now
+
+    def seed(
+        self,
+        customers,
+        categories,
+        products,
+        orders,
+        items_per_order=3,
+        carts=0,
+        items_per_cart=3,
+    ):
+        """Create all rows and return the emails of the seeded actors."""
+        roles = self.seed_roles()
+        actors = self.seed_staff(roles)
+        customer_ids = self.seed_customers(customers, roles)
+        product_prices = self.seed_catalog(categories, products)
+        product_ids = list(product_prices)
+        self.seed_orders(orders, items_per_order, customer_ids, product_prices)
+        self.seed_carts(carts, items_per_cart, customer_ids, product_ids)
+        # bulk_create sends no signals.
+        bump_generation(Category)
+        bump_generation(Product)
+        rebuild_rollups(chunk_size=self.chunk_size)
+        if customers:
+            actors["customer"] = self.email("customer0")
+        return actors
+
+    def email(self, local_part):
+        return f"{local_part}@{self.email_domain}"
+
+    def seed_roles(self):
+        roles = {}
+        for name in ROLE_RULES:
+            roles[name], _ = Role.objects.get_or_create(name=name)
+        elements = {}
+        for rules in ROLE_RULES.values():
+            for name in rules:
+                if name not in elements:
+                    elements[name], _ = BusinessElement.objects.get_or_create(name=name)
+        AccessRule.objects.bulk_create(
+            [
+                AccessRule(
+                    role=roles[role], business_element=elements[element], **flags
+                )
+                for role, rules in ROLE_RULES.items()
+                for element, flags in rules.items()
+            ],
+            ignore_conflicts=True,
+        )
+        return roles
+
+    def seed_staff(self, roles):
+        admin = User.objects.create(
+            email=self.email("admin"), password=self.password_hash
+        )
+        manager = User.objects.create(
+            email=self.email("manager"), password=self.password_hash
+        )
+        admin.roles.add(roles["admin"])
+        manager.roles.add(roles["manager"], roles["user"])
+        self.progress(User, 2)
+        return {"admin": admin.email, "manager": manager.email}
+
+    def seed_customers(self, count, roles):
+        Membership = User.roles.through
+        role_ids = [roles[name].id for name in CUSTOMER_ROLES]
+        customer_ids = []
+        for chunk in chunked_range(count, self.chunk_size):
+            with transaction.atomic():
+                users = User.objects.bulk_create(
+                    User(email=self.email(f"customer{i}"), password=self.password_hash)
+                    for i in chunk
+                )
+                Membership.objects.bulk_create(
+                    Membership(user_id=user.id, role_id=role_id)
+                    for user in users
+                    for role_id in role_ids
+                )
+            customer_ids.extend(user.id for user in users)
+            self.progress(User, len(users))
+        return customer_ids
+
+    def seed_catalog(self, categories, products):
+        category_ids = []
+        for chunk in chunked_range(categories, self.chunk_size):
+            created = Category.objects.bulk_create(
+                Category(name=f"Category {i}") for i in chunk
+            )
+            category_ids.extend(category.id for category in created)
+            self.progress(Category, len(created))
+
+        product_prices = {}
+        for chunk in chunked_range(products, self.chunk_size):
+            created = Product.objects.bulk_create(
+                Product(
+                    name=f"Product {i}",
+                    category_id=self.rng.choice(category_ids),
+                    price=Decimal(self.rng.randint(100, 100000)) / 100,
+                )
+                for i in chunk
+            )
+            product_prices.update((product.id, product.price) for product in created)
+            self.progress(Product, len(created))
+        return product_prices
+
+    def seed_orders(self, count, items_per_order, customer_ids, product_prices):
+        if not customer_ids:
+            return
+        product_ids = list(product_prices)
+        statuses = [status for status, _ in Order.STATUS_CHOICES]
+        items_per_order = min(items_per_order, len(product_ids))
+        max_age = self.days * 24 * 3600
+        for chunk in chunked_range(count, self.chunk_size):
+            orders = []
+            items = []
+            for i in chunk:
+                lines = [
+                    OrderItem(
+                        product_id=product_id,
+                        quantity=self.rng.randint(1, 5),
+                        unit_price=product_prices[product_id],
+                    )
+                    for product_id in self.rng.sample(product_ids, items_per_order)
+                ]
+                total_amount, item_count = order_totals(lines)
+                orders.append(
+                    Order(
+                        user_id=customer_ids[i % len(customer_ids)],
+                        status=self.rng.choice(statuses),
+                        created_at=self.now
+                        - timedelta(seconds=self.rng.randint(0, max_age)),
+                        total_amount=total_amount,
+                        item_count=item_count,
+                    )
+                )
+                items.append(lines)
+            with transaction.atomic():
+                Order.objects.bulk_create(orders)
+                for order, lines in zip(orders, items):
+                    for item in lines:
+                        item.order_id = order.id
+                OrderItem.objects.bulk_create(item for lines in items for item in lines)
+            self.progress(Order, len(orders))
+
+    def seed_carts(self, count, items_per_cart, customer_ids, product_ids):
+        items_per_cart = min(items_per_cart, len(product_ids))
+        for chunk in chunked_range(min(count, len(customer_ids)), self.chunk_size):
+            with transaction.atomic():
+                carts = Cart.objects.bulk_create(
+                    Cart(user_id=customer_ids[i]) for i in chunk
+                )
+                CartItem.objects.bulk_create(
+                    CartItem(
+                        cart_id=cart.id,
+                        product_id=product_id,
+                        quantity=self.rng.randint(1, 3),
+                    )
+                    for cart in carts
+                    for product_id in self.rng.sample(product_ids, items_per_cart)
+                )
+            self.progress(Cart, len(carts))
+
+
+def seed_benchmark_data(scale="small", seed=0):
+    """
+    Create the data set of ``scale`` for the benchmark runner and return the
+    emails of the seeded admin, manager and customer. All users share
+    BENCHMARK_PASSWORD.
+    """
+    return DataSeeder(seed=seed).seed(**SCALES[scale])
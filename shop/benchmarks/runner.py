@@ -0,0 +1,186 @@
+import platform
+import statistics
+import time
+from datetime import timedelta
+
+import django
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from shop.benchmarks.data import BENCHMARK_PASSWORD, REFERENCE_TIME
+from shop.models import Order, Product
+
+
+class Scenario:
+    """A single API call replayed by the runner as ``actor``."""
+
+    def __init__(self, name, method, url, actor=None, data=None, status=200):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.actor = actor
+        self.data = data
+        self.status = status
+
+
+def default_scenarios(actors):
+    product_id = Product.objects.values_list("id", flat=True).first()
+    order_id = (
+        Order.objects.filter(user__email=actors["customer"])
+        .values_list("id", flat=True)
+        .first()
+    )
+    # The last 30 days of seeded orders, like the report's default range.
+    until = REFERENCE_TIME.date()
+    since = until - timedelta(days=29)
+    return [
+        Scenario(
+            "login",
+            "post",
+            reverse("users:login"),
+            data={"email": actors["customer"], "password": BENCHMARK_PASSWORD},
+        ),
+        Scenario("product-list", "get", reverse("shop:product-list"), "customer"),
+        Scenario(
+            "product-detail",
+            "get",
+            reverse("shop:product-detail", args=[product_id]),
+            "customer",
+        ),
+        Scenario("order-list-own", "get", reverse("shop:order-list"), "customer"),
+        Scenario("order-list-all", "get", reverse("shop:order-list"), "manager"),
+        Scenario(
+            "order-detail",
+            "get",
+            reverse("shop:order-detail", args=[order_id]),
+            "customer",
+        ),
+        Scenario(
+            "report-daily-revenue",
+            "get",
+            f"{reverse('shop:report-daily-revenue')}?since={since}&until={until}",
+            "admin",
+        ),
+        # Rejected by AccessRulePermission before touching the view.
+        Scenario(
+            "category-create-denied",
+            "post",
+            reverse("shop:category-list"),
+            "customer",
+            data={"name": "Denied"},
+            status=403,
+        ),
+    ]
+
+
+def percentile(sorted_values, percent):
+    """Linear-interpolated percentile of an already sorted list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(latencies, query_counts):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_per_request": round(statistics.fmean(query_counts), 2),
+        "max_queries": max(query_counts),
+    }
+
+
+def login(client, email):
+    response = client.post(
+        reverse("users:login"), {"email": email, "password": BENCHMARK_PASSWORD}
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark login for {email} failed: {response.data}")
+    return response.data["token"]
+
+
+def run_scenario(client, scenario, iterations, warmup):
+    send = getattr(client, scenario.method)
+    kwargs = {"format": "json"} if scenario.data is not None else {}
+    latencies = []
+    query_counts = []
+    for i in range(warmup + iterations):
+        start = time.perf_counter()
+        response = send(scenario.url, scenario.data, **kwargs)
+        elapsed = time.perf_counter() - start
+        if response.status_code != scenario.status:
+            raise RuntimeError(
+                f"{scenario.name}: expected {scenario.status}, "
+                f"got {response.status_code}"
+            )
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            # Counted by toshop.metrics.QueryMetricsMiddleware.
+            query_counts.append(response.wsgi_request.metrics.query_count)
+    return summarize(latencies, query_counts)
+
+
+def run_benchmarks(actors, iterations=100, warmup=5, scenarios=None):
+    """
+    Replay every scenario ``iterations`` times through the full middleware,
+    authentication and permission stack and return a JSON-serializable
+    report. Actors authenticate with real tokens obtained from the login
+    endpoint.
+    """
+    if scenarios is None:
+        scenarios = default_scenarios(actors)
+
+    tokens = {}
+    results = {}
+    for scenario in scenarios:
+        client = APIClient()
+        if scenario.actor:
+            if scenario.actor not in tokens:
+                tokens[scenario.actor] = login(client, actors[scenario.actor])
+            client.credentials(HTTP_AUTHORIZATION=f"Token {tokens[scenario.actor]}")
+        results[scenario.name] = run_scenario(client, scenario, iterations, warmup)
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "iterations": iterations,
+            "warmup": warmup,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "scenarios": results,
+    }
+
+
+def compare_reports(baseline, current, tolerance=0.2, min_delta_ms=1.0):
+    """
+    Return human-readable regressions of ``current`` against ``baseline``:
+    any increase in queries per request, or a p95 latency more than
+    ``tolerance`` (and at least ``min_delta_ms``) above the baseline.
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        if result["queries_per_request"] > before["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries per request "
+                f"{before['queries_per_request']} -> {result['queries_per_request']}"
+            )
+        delta = result["p95_ms"] - before["p95_ms"]
+        if delta > before["p95_ms"] * tolerance and delta >= min_delta_ms:
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms"
+            )
+    return regressions
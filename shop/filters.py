@@ -0,0 +1,62 @@
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    category = serializers.IntegerField(required=False, min_value=1)
+    min_price = serializers.DecimalField(
+        required=False, max_digits=10, decimal_places=2
+    )
+    max_price = serializers.DecimalField(
+        required=False, max_digits=10, decimal_places=2
+    )
+    name = serializers.CharField(required=False, max_length=255)
+
+    def validate(self, attrs):
+        min_price = attrs.get("min_price")
+        max_price = attrs.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError(
+                {"max_price": "Must not be lower than min_price."}
+            )
+        return attrs
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    """
+    Filters products by ``category`` id, ``min_price``/``max_price``
+    (inclusive) and ``name`` prefix. The lookups map onto the
+    Product(category, price) and name indexes; the prefix match is a plain
+    ``startswith`` so PostgreSQL can use the name ``varchar_pattern_ops``
+    index. Invalid parameters are answered with 400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = ProductFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        if "category" in params:
+            queryset = queryset.filter(category_id=params["category"])
+        if "min_price" in params:
+            queryset = queryset.filter(price__gte=params["min_price"])
+        if "max_price" in params:
+            queryset = queryset.filter(price__lte=params["max_price"])
+        if params.get("name"):
+            queryset = queryset.filter(name__startswith=params["name"])
+        return queryset
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that appends ``id`` to the requested fields, so cursor
+    pagination over non-unique columns such as price has a total order.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not any(
+            field.lstrip("-") in ("id", "pk") for field in ordering
+        ):
+            ordering = [*ordering, "id"]
+        return ordering
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import (
+    DecimalField,
+    F,
+    Max,
+    OuterRef,
+    PositiveIntegerField,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from shop.models import Order, OrderItem, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in missing order item unit prices from current product prices "
+        "and recompute every order's total_amount and item_count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Orders updated per transaction, by id range.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        current_price = Subquery(
+            Product.objects.filter(pk=OuterRef("product_id")).values("price")[:1]
+        )
+        items = OrderItem.objects.filter(order=OuterRef("pk")).values("order")
+        total_amount = Coalesce(
+            Subquery(
+                items.annotate(total=Sum(F("unit_price") * F("quantity"))).values(
+                    "total"
+                )
+            ),
+            Value(Decimal(0)),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+        item_count = Coalesce(
+            Subquery(items.annotate(count=Sum("quantity")).values("count")),
+            Value(0),
+            output_field=PositiveIntegerField(),
+        )
+
+        last_id = Order.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+        priced = updated = 0
+        for start in range(0, last_id, chunk_size):
+            end = start + chunk_size
+            with transaction.atomic():
+                priced += OrderItem.objects.filter(
+                    order_id__gt=start, order_id__lte=end, unit_price__isnull=True
+                ).update(unit_price=current_price)
+                updated += Order.objects.filter(id__gt=start, id__lte=end).update(
+                    total_amount=total_amount, item_count=item_count
+                )
+            self.stdout.write(f"Orders up to id {min(end, last_id)}: done.")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Priced {priced} order items, updated totals of {updated} orders."
+            )
+        )
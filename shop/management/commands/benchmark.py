@@ -0,0 +1,76 @@
+import json
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from shop.benchmarks.data import SCALES, seed_benchmark_data
+from shop.benchmarks.runner import compare_reports, run_benchmarks
+from shop.utils.permission_matrix import invalidate_matrix
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and measure latency percentiles and "
+        "queries per request of the main API endpoints."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+        parser.add_argument(
+            "--baseline",
+            help="Compare against a previous JSON report and fail on regressions.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative p95 increase over the baseline.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+
+        report = self.run(options)
+
+        for name, result in report["scenarios"].items():
+            self.stdout.write(
+                f"{name:<24} p50={result['p50_ms']:>8.2f}ms "
+                f"p95={result['p95_ms']:>8.2f}ms p99={result['p99_ms']:>8.2f}ms "
+                f"queries={result['queries_per_request']}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f"Report written to {options['output']}.")
+
+        if baseline is not None:
+            regressions = compare_reports(baseline, report, options["tolerance"])
+            if regressions:
+                raise CommandError(
+                    "Regressions against baseline:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def run(self, options):
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for cache in caches.all():
+                cache.clear()
+            invalidate_matrix()
+            actors = seed_benchmark_data(options["scale"], options["seed"])
+            return run_benchmarks(actors, options["iterations"], options["warmup"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
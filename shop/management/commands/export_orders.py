@@ -0,0 +1,46 @@
+from datetime import date, datetime, time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from shop.models import Order
+from shop.utils.order_export import FORMATS, export_orders
+
+
+def start_of_day(value):
+    return timezone.make_aware(datetime.combine(date.fromisoformat(value), time.min))
+
+
+class Command(BaseCommand):
+    help = "Stream orders with their items as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument(
+            "--output", help="File to write to; standard output by default."
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--status", choices=[s for s, _ in Order.STATUS_CHOICES])
+        parser.add_argument(
+            "--since", type=start_of_day, help="First day to export (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--until", type=start_of_day, help="Export up to this day, exclusive."
+        )
+
+    def handle(self, *args, **options):
+        queryset = Order.objects.all()
+        if options["status"]:
+            queryset = queryset.filter(status=options["status"])
+        if options["since"]:
+            queryset = queryset.filter(created_at__gte=options["since"])
+        if options["until"]:
+            queryset = queryset.filter(created_at__lt=options["until"])
+
+        lines = export_orders(queryset, options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.utils.product_import import FORMATS, guess_format, import_products
+
+
+class Command(BaseCommand):
+    help = "Upsert products by SKU from a CSV (with header row) or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format; guessed from the file extension by default.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--create-categories",
+            action="store_true",
+            help="Create unknown categories instead of rejecting their rows.",
+        )
+
+    def handle(self, *args, **options):
+        format = options["format"] or guess_format(options["path"])
+        if format is None:
+            raise CommandError("Cannot guess the format, pass --format.")
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+            result = import_products(
+                stream,
+                format,
+                chunk_size=options["chunk_size"],
+                create_categories=options["create_categories"],
+            )
+
+        for error in result["errors"]:
+            self.stderr.write(f"Line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['imported']} products, "
+                f"{result['failed']} rows failed."
+            )
+        )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from shop.models import DailyCategorySales, DailyProductSales
+from shop.utils.sales_rollup import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the daily category and product sales rollups from all "
+        "completed orders, replacing their current contents."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Rollup rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        rebuild_rollups(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {DailyCategorySales.objects.count()} category and "
+                f"{DailyProductSales.objects.count()} product rollup rows."
+            )
+        )
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from shop.benchmarks.data import (
+    BENCHMARK_EMAIL_DOMAIN,
+    BENCHMARK_PASSWORD,
+    REFERENCE_TIME,
+    SCALES,
+    DataSeeder,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a deterministic data set of configurable size "
+        "for performance testing. Counts default to the chosen --scale."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        for name in SCALES["small"]:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int)
+        parser.add_argument("--items-per-cart", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=10000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help=(
+                "Spread order creation dates over this many days before "
+                f"{REFERENCE_TIME.date()}."
+            ),
+        )
+        parser.add_argument("--password", default=BENCHMARK_PASSWORD)
+        parser.add_argument("--email-domain", default=BENCHMARK_EMAIL_DOMAIN)
+
+    def handle(self, *args, **options):
+        counts = dict(SCALES[options["scale"]])
+        for name in counts:
+            if options[name] is not None:
+                counts[name] = options[name]
+        counts["items_per_cart"] = options["items_per_cart"]
+
+        totals = {}
+        start = time.monotonic()
+
+        def progress(model, created):
+            totals[model.__name__] = totals.get(model.__name__, 0) + created
+            self.stdout.write(
+                f"{model.__name__}: {totals[model.__name__]} "
+                f"({time.monotonic() - start:.1f}s)"
+            )
+
+        seeder = DataSeeder(
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+            password=options["password"],
+            email_domain=options["email_domain"],
+            days=options["days"],
+            progress=progress,
+        )
+        actors = seeder.seed(**counts)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded in {time.monotonic() - start:.1f}s. "
+                f"Log in as {', '.join(actors.values())} "
+                f"with password {options['password']!r}."
+            )
+        )
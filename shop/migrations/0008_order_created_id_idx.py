@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0007_accessrule_can_create_for_other_users'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='shop_order_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.25 on 2026-10-18 14:36
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_cart_items(apps, schema_editor):
+    CartItem = apps.get_model("shop", "CartItem")
+    duplicates = (
+        CartItem.objects.values("cart_id", "product_id")
+        .annotate(lines=Count("id"), total=Sum("quantity"))
+        .filter(lines__gt=1)
+    )
+    for duplicate in duplicates:
+        items = CartItem.objects.filter(
+            cart_id=duplicate["cart_id"], product_id=duplicate["product_id"]
+        ).order_by("id")
+        keep = items.first()
+        items.exclude(pk=keep.pk).delete()
+        CartItem.objects.filter(pk=keep.pk).update(quantity=duplicate["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0009_order_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_cart_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'product'), name='shop_cartitem_cart_product_uniq'),
+        ),
+    ]
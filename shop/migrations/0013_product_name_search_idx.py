@@ -0,0 +1,37 @@
+# Generated by Django 4.2.25 on 2026-10-18 15:10
+
+from django.db import migrations
+
+INDEX_NAME = "shop_product_name_search_idx"
+
+
+def _search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector("name", config="simple"), name=INDEX_NAME)
+
+
+def add_search_index(apps, schema_editor):
+    # Other databases search through the in-process index in
+    # shop.utils.search.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.add_index(apps.get_model("shop", "Product"), _search_index())
+
+
+def remove_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.remove_index(apps.get_model("shop", "Product"), _search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0012_product_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_index, remove_search_index),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.25 on 2026-10-18 15:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0015_order_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('day', models.DateField()),
+                (
+                    'revenue',
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ('units', models.BigIntegerField(default=0)),
+                ('orders', models.IntegerField(default=0)),
+                (
+                    'product',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='shop.product',
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyCategorySales',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('day', models.DateField()),
+                (
+                    'revenue',
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ('units', models.BigIntegerField(default=0)),
+                ('orders', models.IntegerField(default=0)),
+                (
+                    'category',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='+',
+                        to='shop.category',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyproductsales',
+            constraint=models.UniqueConstraint(
+                fields=('day', 'product'), name='shop_dailyproductsales_uniq'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='dailycategorysales',
+            constraint=models.UniqueConstraint(
+                fields=('day', 'category'), name='shop_dailycategorysales_uniq'
+            ),
+        ),
+    ]
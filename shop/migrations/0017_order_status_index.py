@@ -0,0 +1,19 @@
+# Generated by Django 4.2.25 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0016_sales_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(
+                fields=['status', 'created_at'], name='shop_order_status_created_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Before AccessRulePermission, these roles could act on every user's orders
+# with whatever flags their Order rule granted; other roles only on their
+# own. Ownership is now decided by the *_all flags, so grant them to keep
+# existing rules working as they did.
+ALL_ORDERS_ROLES = ("admin", "manager")
+
+ALL_FLAGS = {
+    "read_permission": "read_all_permission",
+    "update_permission": "update_all_permission",
+    "delete_permission": "delete_all_permission",
+}
+
+
+def grant_all_order_flags(apps, schema_editor):
+    AccessRule = apps.get_model("shop", "AccessRule")
+    rules = AccessRule.objects.filter(
+        business_element__name="Order", role__name__in=ALL_ORDERS_ROLES
+    )
+    for flag, all_flag in ALL_FLAGS.items():
+        rules.filter(**{flag: True}).update(**{all_flag: True})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("shop", "0017_order_status_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(grant_all_order_flags, migrations.RunPython.noop),
+    ]
@@ -1,21 +1,32 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 
 class Category(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.name
 
 
 class Product(models.Model):
-    name = models.CharField(max_length=255)
+    sku = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    name = models.CharField(max_length=255, db_index=True)
     category = models.ForeignKey(
         "Category", on_delete=models.CASCADE, related_name="products"
     )
     price = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "price"], name="shop_product_cat_price_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -28,17 +39,78 @@ class Order(models.Model):
         ("completed", "Completed"),
         ("canceled", "Canceled"),
     ]
+    # transition name -> (statuses it may start from, resulting status)
+    TRANSITIONS = {
+        "process": (("pending",), "processing"),
+        "complete": (("processing",), "completed"),
+        "cancel": (("pending", "processing"), "canceled"),
+    }
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="orders"
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so bulk loads can keep their own
+    # dates; the API treats it as read-only.
+    created_at = models.DateTimeField(default=timezone.now)
+    # Maintained by OrderSerializer from the items' unit prices; item_count
+    # is the total quantity ordered.
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="shop_order_created_id_idx"),
+            models.Index(
+                fields=["user", "created_at", "id"], name="shop_order_user_created_idx"
+            ),
+            # The fulfillment queue: orders in one status, oldest first.
+            models.Index(
+                fields=["status", "created_at"], name="shop_order_status_created_idx"
+            ),
+        ]
 
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
     product = models.ForeignKey("Product", on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
+    # Product price when the item was ordered. Null only for items created
+    # before prices were recorded, see the backfill_order_totals command.
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+
+
+class DailyCategorySales(models.Model):
+    """Completed-order sales per day (of order creation) and category."""
+
+    day = models.DateField()
+    category = models.ForeignKey("Category", on_delete=models.CASCADE, related_name="+")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.BigIntegerField(default=0)
+    orders = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "category"], name="shop_dailycategorysales_uniq"
+            ),
+        ]
+
+
+class DailyProductSales(models.Model):
+    """Completed-order sales per day (of order creation) and product."""
+
+    day = models.DateField()
+    product = models.ForeignKey("Product", on_delete=models.CASCADE, related_name="+")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    units = models.BigIntegerField(default=0)
+    orders = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "product"], name="shop_dailyproductsales_uniq"
+            ),
+        ]
 
 
 class Cart(models.Model):
@@ -52,6 +124,13 @@ class CartItem(models.Model):
     product = models.ForeignKey("Product", on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cart", "product"], name="shop_cartitem_cart_product_uniq"
+            ),
+        ]
+
 
 class Role(models.Model):
     name = models.CharField(max_length=50, unique=True)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the primary key: every page is an indexed range
+    scan, however deep the client has paged.
+    """
+
+    ordering = "id"
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class OrderCursorPagination(IdCursorPagination):
+    """Newest orders first, backed by the (created_at, id) index."""
+
+    ordering = ("-created_at", "-id")
+
+
+class SearchPagination(PageNumberPagination):
+    """Numbered pages for ranked search results, which have no stable key."""
+
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
@@ -1,210 +1,155 @@
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework import viewsets, permissions, serializers, exceptions
-from shop.models import AccessRule, BusinessElement
+from shop.utils.permission_matrix import (
+    get_matrix,
+    invalidate_matrix,
+    READ,
+    READ_ALL,
+    CREATE,
+    CREATE_FOR_OTHER_USERS,
+    UPDATE,
+    UPDATE_ALL,
+    DELETE,
+    DELETE_ALL,
+)
+
+METHOD_FLAGS = {
+    "GET": READ,
+    "HEAD": READ,
+    "OPTIONS": READ,
+    "POST": CREATE,
+    "PUT": UPDATE,
+    "PATCH": UPDATE,
+    "DELETE": DELETE,
+}
+
+# Flag required to act on objects owned by another user.
+ALL_OBJECTS_FLAGS = {
+    READ: READ_ALL,
+    UPDATE: UPDATE_ALL,
+    DELETE: DELETE_ALL,
+}
+
+
+class EffectiveRules:
+    """
+    The authenticated user's roles resolved against the permission matrix.
+    Built once per request by get_effective_rules().
+    """
+
+    def __init__(self, user, role_ids, matrix):
+        self.user_id = user.pk
+        self.role_ids = tuple(role_ids)
+        self.matrix = matrix
+        self._masks = {}
+
+    @property
+    def role_names(self):
+        return {self.matrix.role_names.get(role_id) for role_id in self.role_ids}
+
+    def has_role(self, name):
+        return name in self.role_names
+
+    def mask(self, element_name):
+        """OR of the AccessRule masks of all the user's roles for the element."""
+        if element_name not in self._masks:
+            mask = 0
+            for role_id in self.role_ids:
+                mask |= self.matrix.get_mask(role_id, element_name) or 0
+            self._masks[element_name] = mask
+        return self._masks[element_name]
+
+    def has(self, element_name, flag):
+        return bool(self.mask(element_name) & flag)
+
+
+def get_effective_rules(request):
+    """
+    Return the EffectiveRules of ``request.user``, computing them on first
+    use and caching them on the request so every permission class and the
+    view share a single roles query. Role ids already resolved by the
+    authentication layer (``user.cached_role_ids``) are reused as-is.
+    """
+    user = request.user
+    rules = getattr(request, "_effective_rules", None)
+    if rules is not None and rules.user_id == user.pk:
+        return rules
+
+    role_ids = getattr(user, "cached_role_ids", None)
+    if role_ids is None:
+        role_ids = list(user.roles.values_list("id", flat=True))
+    matrix = get_matrix()
+    if not set(role_ids) <= matrix.role_names.keys():
+        # A role created by another process; don't wait for the TTL.
+        invalidate_matrix()
+        matrix = get_matrix()
+
+    rules = EffectiveRules(user, role_ids, matrix)
+    request._effective_rules = rules
+    return rules
 
 
 class AccessRulePermission(BasePermission):
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        element_name = "Category"
-        try:
-            element = BusinessElement.objects.get(name=element_name)
-        except BusinessElement.DoesNotExist:
-            return False
-
-        user_roles = request.user.roles.all()
-
-        if request.method in SAFE_METHODS:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.read_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        if request.method == "POST":
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.create_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        if request.method in ["PUT", "PATCH"]:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.update_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        elif request.method == "DELETE":
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.delete_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        return True
-
-
-class AccessRulePermissionProduct(BasePermission):
-    def has_permission(self, request, view):
-        if not request.user or not request.user.is_authenticated:
-            return False
-
-        element_name = "Product"
-        try:
-            element = BusinessElement.objects.get(name=element_name)
-        except BusinessElement.DoesNotExist:
-            return False
-
-        user_roles = request.user.roles.all()
-
-        if request.method in SAFE_METHODS:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.read_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        if request.method == "POST":
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.create_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        if request.method in ["PUT", "PATCH"]:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.update_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        elif request.method == "DELETE":
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.delete_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        return True
-
+    """
+    Checks the AccessRules of the view's ``business_element``.
+
+    Extra actions are checked against the flag of their HTTP method unless
+    the view maps the action to another flag in ``action_flags``.
+
+    Views that set ``owner_field`` also get ownership checks: creating an
+    object for another user requires ``can_create_for_other_users``, and
+    reading, updating or deleting another user's object requires the matching
+    ``*_all_permission`` flag.
+    """
+
+    def get_business_element(self, view):
+        element_name = getattr(view, "business_element", None)
+        if element_name is None:
+            raise ImproperlyConfigured(
+                f"{view.__class__.__name__} must define 'business_element' "
+                f"to use {self.__class__.__name__}."
+            )
+        return element_name
+
+    def get_flag(self, request, view):
+        action_flags = getattr(view, "action_flags", {})
+        action = getattr(view, "action", None)
+        if action in action_flags:
+            return action_flags[action]
+        return METHOD_FLAGS.get(request.method)
 
-class AccessRulePermissionOrder(BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
             return False
 
-        element_name = "Order"
-        try:
-            element = BusinessElement.objects.get(name=element_name)
-        except BusinessElement.DoesNotExist:
-            return False
-
-        user_roles = request.user.roles.all()
-
-        if request.method in SAFE_METHODS:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.read_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
+        flag = self.get_flag(request, view)
+        if flag is None:
+            return True
 
-        if request.method == "POST":
-            if request.method == "POST":
-                user_id = request.data.get("user")
-
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if (
-                        str(request.user.id) != str(user_id)
-                        and not rule.can_create_for_other_users
-                    ):
-                        return False
-                    if rule.create_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        if request.method in ["PUT", "PATCH"]:
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.update_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
-            return False
-
-        elif request.method == "DELETE":
-            for role in user_roles:
-                try:
-                    rule = AccessRule.objects.get(role=role, business_element=element)
-                    if rule.delete_permission:
-                        return True
-                except AccessRule.DoesNotExist:
-                    continue
+        mask = get_effective_rules(request).mask(self.get_business_element(view))
+        if not mask & flag:
             return False
 
+        owner_field = getattr(view, "owner_field", None)
+        if flag == CREATE and owner_field:
+            owner_id = request.data.get(owner_field)
+            if str(request.user.id) != str(owner_id):
+                return bool(mask & CREATE_FOR_OTHER_USERS)
         return True
 
     def has_object_permission(self, request, view, obj):
-        user_roles = request.user.roles.all()
-
-        for role in user_roles:
-            try:
-                rule = AccessRule.objects.get(role=role, business_element__name="Order")
-                if role.name in ["admin", "manager"]:
-                    if request.method in SAFE_METHODS and rule.read_permission:
-                        return True
-                    if request.method in ["PUT", "PATCH"] and rule.update_permission:
-                        return True
-                    if request.method == "DELETE" and rule.delete_permission:
-                        return True
-                elif role.name == "user":
-                    if obj.user == request.user:
-                        if request.method in SAFE_METHODS and rule.read_permission:
-                            return True
-                        if (
-                            request.method in ["PUT", "PATCH"]
-                            and rule.update_permission
-                        ):
-                            return True
-                        if request.method == "DELETE" and rule.delete_permission:
-                            return True
-            except AccessRule.DoesNotExist:
-                continue
-        return False
+        owner_field = getattr(view, "owner_field", None)
+        flag = self.get_flag(request, view)
+        if owner_field is None or flag not in ALL_OBJECTS_FLAGS:
+            return True
+
+        if getattr(obj, f"{owner_field}_id") == request.user.id:
+            required = flag
+        else:
+            required = ALL_OBJECTS_FLAGS[flag]
+        rules = get_effective_rules(request)
+        return rules.has(self.get_business_element(view), required)
 
 
 class IsAdminRolePermission(permissions.BasePermission):
@@ -212,5 +157,5 @@ class IsAdminRolePermission(permissions.BasePermission):
         return (
             request.user
             and request.user.is_authenticated
-            and request.user.roles.filter(name="admin").exists()
+            and get_effective_rules(request).has_role("admin")
         )
@@ -1,3 +1,7 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from .models import (
     Cart,
@@ -10,6 +14,20 @@ from .models import (
     BusinessElement,
     AccessRule,
 )
+from .utils.order_status import (
+    INITIAL_STATUS,
+    StatusConflict,
+    transition_order,
+    transition_to,
+)
+from .utils.sales_rollup import ROLLUP_STATUS
+
+
+def validate_unique_products(items):
+    product_ids = [item["product"].pk for item in items]
+    if len(product_ids) != len(set(product_ids)):
+        raise serializers.ValidationError("Each product may appear only once.")
+    return items
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -21,7 +39,16 @@ class CategorySerializer(serializers.ModelSerializer):
 class ProductSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
-        fields = ["id", "name", "category", "price"]
+        fields = ["id", "sku", "name", "category", "price"]
+
+
+class ProductImportSerializer(serializers.Serializer):
+    """One row of a product feed; the category is referenced by name."""
+
+    sku = serializers.CharField(max_length=64)
+    name = serializers.CharField(max_length=255)
+    category = serializers.CharField(max_length=255)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -30,34 +57,144 @@ class OrderItemSerializer(serializers.ModelSerializer):
         fields = ["product", "quantity"]
 
 
+def order_totals(items):
+    """Return ``(total_amount, item_count)`` of priced order items."""
+    total_amount = sum((item.unit_price * item.quantity for item in items), Decimal(0))
+    return total_amount, sum(item.quantity for item in items)
+
+
 class OrderSerializer(serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, required=False)
 
     class Meta:
         model = Order
-        fields = ["id", "user", "status", "items", "created_at"]
+        fields = [
+            "id",
+            "user",
+            "status",
+            "items",
+            "total_amount",
+            "item_count",
+            "created_at",
+        ]
+        read_only_fields = ["total_amount", "item_count", "created_at"]
+
+    def validate_items(self, items):
+        return validate_unique_products(items)
+
+    def validate_status(self, value):
+        if self.instance is None:
+            if value != INITIAL_STATUS:
+                raise serializers.ValidationError(
+                    f'New orders start as "{INITIAL_STATUS}".'
+                )
+        elif transition_to(value) is None:
+            raise serializers.ValidationError(f'No transition leads to "{value}".')
+        return value
 
     def create(self, validated_data):
-        items_data = validated_data.pop("items")
-        order = Order.objects.create(**validated_data)
-        for item_data in items_data:
-            OrderItem.objects.create(order=order, **item_data)
+        items_data = validated_data.pop("items", [])
+        items = [
+            OrderItem(unit_price=item_data["product"].price, **item_data)
+            for item_data in items_data
+        ]
+        total_amount, item_count = order_totals(items)
+        with transaction.atomic():
+            order = Order.objects.create(
+                total_amount=total_amount, item_count=item_count, **validated_data
+            )
+            for item in items:
+                item.order = order
+            OrderItem.objects.bulk_create(items)
         return order
 
     def update(self, instance, validated_data):
+        """
+        Save the given fields only. The instance's status may be stale, so
+        it is never written back: a status change runs the matching
+        transition as a conditional update. Items of a completed order are
+        frozen, as its sales are already in the rollups; the status is
+        re-read under a row lock to check that.
+        """
         items_data = validated_data.pop("items", None)
+        new_status = validated_data.pop("status", None)
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-
-        if items_data is not None:
-            instance.items.all().delete()
-            for item_data in items_data:
-                OrderItem.objects.create(order=instance, **item_data)
+        with transaction.atomic():
+            update_fields = list(validated_data)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            if items_data is not None:
+                instance.status = (
+                    Order.objects.select_for_update()
+                    .values_list("status", flat=True)
+                    .get(pk=instance.pk)
+                )
+                if instance.status == ROLLUP_STATUS:
+                    raise serializers.ValidationError(
+                        {"items": "Items of a completed order can't be changed."}
+                    )
+                items = self._sync_items(instance, items_data)
+                instance.total_amount, instance.item_count = order_totals(items)
+                update_fields += ["total_amount", "item_count"]
+            if update_fields:
+                instance.save(update_fields=update_fields)
+            if new_status is not None:
+                self._change_status(instance, new_status)
 
         return instance
 
+    def _change_status(self, order, new_status):
+        name = transition_to(new_status)
+        if not transition_order(order.pk, name):
+            current = Order.objects.values_list("status", flat=True).get(pk=order.pk)
+            if current != new_status:
+                raise StatusConflict(name, current)
+        order.status = new_status
+
+    def _sync_items(self, order, items_data):
+        """
+        Bring the order's items in line with ``items_data`` touching only the
+        lines that changed: new products are inserted at their current price,
+        changed quantities updated and missing products deleted, each in one
+        query. Kept items keep the price they were ordered at. Returns the
+        resulting items.
+        """
+        existing = {}
+        to_delete = []
+        for item in order.items.select_related("product"):
+            if item.product_id in existing:
+                to_delete.append(item.pk)
+            else:
+                existing[item.product_id] = item
+
+        items = []
+        to_create = []
+        to_update = []
+        for item_data in items_data:
+            wanted = OrderItem(
+                order=order, unit_price=item_data["product"].price, **item_data
+            )
+            item = existing.pop(wanted.product_id, None)
+            if item is None:
+                to_create.append(wanted)
+                items.append(wanted)
+                continue
+            if item.quantity != wanted.quantity or item.unit_price is None:
+                item.quantity = wanted.quantity
+                if item.unit_price is None:
+                    item.unit_price = item.product.price
+                to_update.append(item)
+            items.append(item)
+        to_delete += [item.pk for item in existing.values()]
+
+        if to_delete:
+            OrderItem.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            OrderItem.objects.bulk_update(to_update, ["quantity", "unit_price"])
+        if to_create:
+            OrderItem.objects.bulk_create(to_create)
+        return items
+
 
 class CartItemSerializer(serializers.ModelSerializer):
     class Meta:
@@ -65,6 +202,11 @@ class CartItemSerializer(serializers.ModelSerializer):
         fields = ["product", "quantity"]
 
 
+class CartLineSerializer(serializers.Serializer):
+    product = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all())
+    quantity = serializers.IntegerField(min_value=1, default=1)
+
+
 class CartSerializer(serializers.ModelSerializer):
     items = CartItemSerializer(many=True)
 
@@ -72,23 +214,47 @@ class CartSerializer(serializers.ModelSerializer):
         model = Cart
         fields = ["id", "items"]
 
+    def validate_items(self, items):
+        return validate_unique_products(items)
+
     def create(self, validated_data):
         items_data = validated_data.pop("items")
         user = self.context["request"].user
-        cart, created = Cart.objects.get_or_create(user=user)
-        cart.items.all().delete()
-        for item_data in items_data:
-            CartItem.objects.create(cart=cart, **item_data)
+        with transaction.atomic():
+            cart, created = Cart.objects.get_or_create(user=user)
+            self._sync_items(cart, items_data)
         return cart
 
     def update(self, instance, validated_data):
         items_data = validated_data.pop("items")
-        instance.items.all().delete()
-        for item_data in items_data:
-            CartItem.objects.create(cart=instance, **item_data)
-        instance.save()
+        with transaction.atomic():
+            self._sync_items(instance, items_data)
         return instance
 
+    def _sync_items(self, cart, items_data):
+        """
+        Make the cart hold exactly ``items_data``. New and changed lines are
+        written with one upsert on (cart, product), removed lines with one
+        delete; unchanged lines are left alone.
+        """
+        existing = dict(cart.items.values_list("product_id", "quantity"))
+
+        changed = []
+        for item_data in items_data:
+            wanted = CartItem(cart=cart, **item_data)
+            if existing.pop(wanted.product_id, None) != wanted.quantity:
+                changed.append(wanted)
+
+        if existing:
+            cart.items.filter(product_id__in=existing).delete()
+        if changed:
+            CartItem.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=["cart", "product"],
+                update_fields=["quantity"],
+            )
+
 
 class AccessRuleSerializer(serializers.ModelSerializer):
     role = serializers.PrimaryKeyRelatedField(queryset=Role.objects.all())
@@ -111,3 +277,35 @@ class AccessRuleSerializer(serializers.ModelSerializer):
             "delete_all_permission",
             "can_create_for_other_users",
         ]
+
+
+class SalesReportSerializer(serializers.Serializer):
+    """Query parameters of the sales reports; the range defaults to 30 days."""
+
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+    category = serializers.IntegerField(required=False, min_value=1)
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=100)
+
+    def validate(self, attrs):
+        until = attrs.setdefault("until", timezone.localdate())
+        since = attrs.setdefault("since", until - timedelta(days=29))
+        if since > until:
+            raise serializers.ValidationError({"until": "Must not be before since."})
+        return attrs
+
+
+class DailyRevenueSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    category_id = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    orders = serializers.IntegerField()
+
+
+class TopProductSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+    units = serializers.IntegerField()
+    orders = serializers.IntegerField()
@@ -0,0 +1,42 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from shop.models import AccessRule, BusinessElement, Category, Order, Product, Role
+from shop.utils.permission_matrix import invalidate_matrix
+from shop.utils import sales_rollup
+from shop.utils.response_cache import bump_generation
+from shop.utils.search import product_index
+
+
+@receiver([post_save, post_delete], sender=AccessRule)
+@receiver([post_save, post_delete], sender=Role)
+@receiver([post_save, post_delete], sender=BusinessElement)
+def reset_permission_matrix(sender, **kwargs):
+    invalidate_matrix()
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_cached_responses(sender, **kwargs):
+    # After commit, so a request can't cache rows read before the write
+    # under the new generation.
+    transaction.on_commit(lambda: bump_generation(sender))
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    product_id, name = instance.id, instance.name
+    transaction.on_commit(lambda: product_index.update(product_id, name))
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    product_id = instance.id
+    transaction.on_commit(lambda: product_index.remove(product_id))
+
+
+@receiver(pre_delete, sender=Order)
+def remove_order_from_rollups(sender, instance, **kwargs):
+    if instance.status == sales_rollup.ROLLUP_STATUS:
+        sales_rollup.apply_order(instance, sign=-1)
@@ -1,3 +1,6 @@
+from importlib import import_module
+from django.apps import apps
+from django.test import TestCase
 from rest_framework import status
 from django.urls import reverse
 from rest_framework.test import APITestCase
@@ -90,3 +93,127 @@ class UserOrderAccessRulePermissionTest(APITestCase):
         url = reverse("shop:order-detail", kwargs={"pk": order.pk})
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AllOrdersAccessRulePermissionTest(APITestCase):
+    def setUp(self):
+        self.role_manager = Role.objects.create(name="manager")
+        self.element_order = BusinessElement.objects.create(name="Order")
+        self.rule = AccessRule.objects.create(
+            role=self.role_manager,
+            business_element=self.element_order,
+            read_permission=True,
+            update_permission=True,
+        )
+
+        self.manager = User.objects.create_user(
+            email="manager_all@example.com", password="managerpass"
+        )
+        self.manager.roles.add(self.role_manager)
+        self.customer = User.objects.create_user(
+            email="customer_all@example.com", password="customerpass"
+        )
+        self.order = Order.objects.create(user=self.customer, status="pending")
+        self.url = reverse("shop:order-detail", kwargs={"pk": self.order.pk})
+
+        self.client.force_authenticate(user=self.manager)
+
+    def test_read_other_order_requires_read_all_permission(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.rule.read_all_permission = True
+        self.rule.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_other_order_requires_update_all_permission(self):
+        response = self.client.patch(self.url, {"status": "processing"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.rule.update_all_permission = True
+        self.rule.save()
+        response = self.client.patch(self.url, {"status": "processing"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_permissions_are_combined_across_roles(self):
+        role_auditor = Role.objects.create(name="auditor")
+        AccessRule.objects.create(
+            role=role_auditor,
+            business_element=self.element_order,
+            read_all_permission=True,
+        )
+        self.manager.roles.add(role_auditor)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class OrderListScopeTest(APITestCase):
+    def setUp(self):
+        self.role_user = Role.objects.create(name="user")
+        self.element_order = BusinessElement.objects.create(name="Order")
+        self.rule = AccessRule.objects.create(
+            role=self.role_user,
+            business_element=self.element_order,
+            read_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="scope_user@example.com", password="userpass"
+        )
+        self.user.roles.add(self.role_user)
+        self.other_user = User.objects.create_user(
+            email="scope_other@example.com", password="otherpass"
+        )
+        self.own_order = Order.objects.create(user=self.user)
+        self.other_order = Order.objects.create(user=self.other_user)
+        self.url = reverse("shop:order-list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_returns_only_own_orders(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [order["id"] for order in response.data["results"]], [self.own_order.id]
+        )
+
+    def test_list_returns_all_orders_with_read_all_permission(self):
+        self.rule.read_all_permission = True
+        self.rule.save()
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [order["id"] for order in response.data["results"]],
+            [self.other_order.id, self.own_order.id],
+        )
+
+
+class GrantAllOrderFlagsMigrationTest(TestCase):
+    def test_admin_and_manager_order_rules_keep_access_to_all_orders(self):
+        migration = import_module("shop.migrations.0018_order_rules_all_flags")
+        order = BusinessElement.objects.create(name="Order")
+        category = BusinessElement.objects.create(name="Category")
+        manager = Role.objects.create(name="manager")
+        customer = Role.objects.create(name="user")
+        manager_rule = AccessRule.objects.create(
+            role=manager,
+            business_element=order,
+            read_permission=True,
+            update_permission=True,
+        )
+        manager_category_rule = AccessRule.objects.create(
+            role=manager, business_element=category, read_permission=True
+        )
+        customer_rule = AccessRule.objects.create(
+            role=customer, business_element=order, read_permission=True
+        )
+
+        migration.grant_all_order_flags(apps, None)
+
+        manager_rule.refresh_from_db()
+        self.assertTrue(manager_rule.read_all_permission)
+        self.assertTrue(manager_rule.update_all_permission)
+        self.assertFalse(manager_rule.delete_all_permission)
+        manager_category_rule.refresh_from_db()
+        self.assertFalse(manager_category_rule.read_all_permission)
+        customer_rule.refresh_from_db()
+        self.assertFalse(customer_rule.read_all_permission)
@@ -147,3 +147,64 @@ class CartAPITest(APITestCase):
         response = self.client.put(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(cart.items.first().quantity, 3)
+
+
+class CartLineAPITest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="lines@example.com", password="password123"
+        )
+        self.category = Category.objects.create(name="Gadgets")
+        self.product = Product.objects.create(
+            name="Smartphone", category=self.category, price=500.00
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _quantity(self):
+        return CartItem.objects.get(cart__user=self.user, product=self.product).quantity
+
+    def test_add_item_creates_cart_and_increments(self):
+        url = reverse("shop:cart-add-item")
+        response = self.client.post(url, {"product": self.product.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"product": self.product.id, "quantity": 1})
+
+        response = self.client.post(
+            url, {"product": self.product.id, "quantity": 2}, format="json"
+        )
+        self.assertEqual(response.data["quantity"], 3)
+        self.assertEqual(self._quantity(), 3)
+
+    def test_set_quantity_upserts_line(self):
+        url = reverse("shop:cart-set-quantity")
+        for quantity in [4, 2]:
+            response = self.client.post(
+                url, {"product": self.product.id, "quantity": quantity}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(self._quantity(), quantity)
+        self.assertEqual(CartItem.objects.count(), 1)
+
+    def test_set_quantity_rejects_zero(self):
+        url = reverse("shop:cart-set-quantity")
+        response = self.client.post(
+            url, {"product": self.product.id, "quantity": 0}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_remove_item(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=1)
+        url = reverse("shop:cart-remove-item")
+
+        response = self.client.post(url, {"product": self.product.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(CartItem.objects.exists())
+
+        response = self.client.post(url, {"product": self.product.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unknown_product_is_rejected(self):
+        url = reverse("shop:cart-add-item")
+        response = self.client.post(url, {"product": 999}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,104 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from shop.benchmarks.data import (
+    BENCHMARK_PASSWORD,
+    REFERENCE_TIME,
+    seed_benchmark_data,
+)
+from shop.benchmarks.runner import compare_reports, percentile, run_benchmarks
+from shop.models import (
+    BusinessElement,
+    Cart,
+    CartItem,
+    Category,
+    Order,
+    OrderItem,
+    Product,
+    Role,
+    User,
+)
+
+
+class BenchmarkRunnerTest(TestCase):
+    def test_seeds_and_reports_every_scenario(self):
+        actors = seed_benchmark_data("tiny")
+        self.assertEqual(User.objects.get(email=actors["customer"]).roles.count(), 3)
+        self.assertEqual(Order.objects.count(), 6)
+        self.assertEqual(OrderItem.objects.count(), 18)
+
+        report = run_benchmarks(actors, iterations=3, warmup=1)
+
+        self.assertEqual(
+            set(report["scenarios"]),
+            {
+                "login",
+                "product-list",
+                "product-detail",
+                "order-list-own",
+                "order-list-all",
+                "order-detail",
+                "report-daily-revenue",
+                "category-create-denied",
+            },
+        )
+        for result in report["scenarios"].values():
+            self.assertEqual(result["requests"], 3)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreaterEqual(result["queries_per_request"], 0)
+
+    def test_seed_is_deterministic(self):
+        seed_benchmark_data("tiny", seed=7)
+        fields = ("product__name", "quantity", "order__created_at")
+        first = list(OrderItem.objects.values_list(*fields))
+        for model in [User, Role, BusinessElement, Category]:
+            model.objects.all().delete()
+        seed_benchmark_data("tiny", seed=7)
+        second = list(OrderItem.objects.values_list(*fields))
+        self.assertEqual(first, second)
+        self.assertTrue(all(created_at <= REFERENCE_TIME for *_, created_at in first))
+
+
+class CompareReportsTest(SimpleTestCase):
+    def report(self, p95, queries):
+        return {
+            "scenarios": {
+                "product-list": {"p95_ms": p95, "queries_per_request": queries}
+            }
+        }
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertEqual(percentile([10, 20], 50), 15)
+        self.assertEqual(percentile([7], 99), 7)
+
+    def test_flags_query_and_latency_regressions(self):
+        regressions = compare_reports(self.report(10, 2), self.report(20, 3))
+        self.assertEqual(len(regressions), 2)
+
+    def test_ignores_noise_within_tolerance(self):
+        self.assertEqual(compare_reports(self.report(10, 2), self.report(11, 2)), [])
+        self.assertEqual(compare_reports(self.report(1, 2), self.report(1.5, 2)), [])
+
+
+class SeedDataCommandTest(TestCase):
+    def test_seeds_requested_counts_in_chunks(self):
+        call_command(
+            "seed_data",
+            "--scale=tiny",
+            "--orders=25",
+            "--items-per-order=2",
+            "--chunk-size=4",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Product.objects.count(), 20)
+        self.assertEqual(Order.objects.count(), 25)
+        self.assertEqual(OrderItem.objects.count(), 50)
+        self.assertEqual(Cart.objects.count(), 3)
+        self.assertEqual(CartItem.objects.count(), 9)
+        self.assertGreater(Order.objects.values("created_at").distinct().count(), 1)
+        customer = User.objects.get(email="customer0@bench.local")
+        self.assertTrue(customer.check_password(BENCHMARK_PASSWORD))
+        self.assertEqual(customer.orders.count(), 9)
@@ -0,0 +1,66 @@
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from shop.models import User, Category, Product, Cart, CartItem
+from shop.serializers import CartSerializer
+
+
+class CartSerializerItemsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="cartitems@example.com", password="cartpass"
+        )
+        category = Category.objects.create(name="Gadgets")
+        self.products = [
+            Product.objects.create(name=f"Gadget {i}", category=category, price=10)
+            for i in range(3)
+        ]
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, product=self.products[0], quantity=1)
+        CartItem.objects.create(cart=self.cart, product=self.products[1], quantity=2)
+
+    def _update(self, *pairs):
+        request = APIRequestFactory().put("/")
+        request.user = self.user
+        serializer = CartSerializer(
+            self.cart,
+            data={
+                "items": [
+                    {"product": self.products[index].id, "quantity": quantity}
+                    for index, quantity in pairs
+                ]
+            },
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        return [
+            q["sql"]
+            for q in queries
+            if q["sql"].split()[0] in ("INSERT", "UPDATE", "DELETE")
+        ]
+
+    def _quantities(self):
+        return dict(self.cart.items.values_list("product_id", "quantity"))
+
+    def test_adding_one_item_writes_only_that_line(self):
+        writes = self._update((0, 1), (1, 2), (2, 4))
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith("INSERT"))
+        self.assertEqual(self._quantities()[self.products[2].id], 4)
+
+    def test_changed_quantity_and_removed_line(self):
+        kept = CartItem.objects.get(cart=self.cart, product=self.products[0])
+        writes = self._update((0, 3))
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(self._quantities(), {self.products[0].id: 3})
+        self.assertEqual(self.cart.items.get().pk, kept.pk)
+
+    def test_unchanged_cart_writes_nothing(self):
+        self.assertEqual(self._update((0, 1), (1, 2)), [])
+
+    def test_cart_product_pair_is_unique(self):
+        with self.assertRaises(IntegrityError):
+            CartItem.objects.create(cart=self.cart, product=self.products[0])
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category, Product
+
+
+@override_settings(RESPONSE_CACHE_TTL=0, TABLE_VERSION_CACHE_TTL=0)
+class CatalogConditionalGetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.role = Role.objects.create(name="user")
+        for name in ["Category", "Product"]:
+            AccessRule.objects.create(
+                role=self.role,
+                business_element=BusinessElement.objects.create(name=name),
+                read_permission=True,
+            )
+        self.user = User.objects.create_user(
+            email="poller@example.com", password="pollerpass"
+        )
+        self.user.roles.add(self.role)
+        self.category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(
+            name="Novel", category=self.category, price=10
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("shop:product-list")
+
+    def test_matching_etag_returns_304_without_main_query(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        product_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"shop_product"' in query["sql"]
+        ]
+        # Only the MAX(updated_at)/COUNT version query.
+        self.assertEqual(len(product_queries), 1)
+        self.assertIn("MAX", product_queries[0])
+
+    def test_etag_changes_on_update_and_delete(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.product.price = 12
+        self.product.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updated_etag = response["ETag"]
+        self.assertNotEqual(updated_etag, etag)
+
+        self.product.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=updated_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_etag_depends_on_query_params(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, {"page_size": 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_and_category_have_etags(self):
+        url = reverse("shop:product-detail", args=[self.product.id])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        url = reverse("shop:category-list")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_permissions_run_before_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        stranger = User.objects.create_user(
+            email="stranger@example.com", password="strangerpass"
+        )
+        self.client.force_authenticate(user=stranger)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(TABLE_VERSION_CACHE_TTL=60)
+    def test_memoized_version_skips_all_product_queries(self):
+        etag = self.client.get(self.url)["ETag"]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(
+            [q for q in context.captured_queries if '"shop_product"' in q["sql"]]
+        )
@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Order
+from shop.permissions import get_effective_rules
+from shop.utils.permission_matrix import get_matrix, READ, UPDATE
+
+
+class EffectiveRulesTest(APITestCase):
+    def setUp(self):
+        self.role_admin = Role.objects.create(name="admin")
+        self.role_user = Role.objects.create(name="user")
+        self.element_order = BusinessElement.objects.create(name="Order")
+        AccessRule.objects.create(
+            role=self.role_user,
+            business_element=self.element_order,
+            read_permission=True,
+        )
+        AccessRule.objects.create(
+            role=self.role_admin,
+            business_element=self.element_order,
+            update_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="rules@example.com", password="rulespass"
+        )
+        self.user.roles.add(self.role_admin, self.role_user)
+        get_matrix()
+
+    def _request(self):
+        request = APIRequestFactory().get("/")
+        request.user = self.user
+        return request
+
+    def test_rules_are_combined_and_memoized_per_request(self):
+        request = self._request()
+        with self.assertNumQueries(1):
+            rules = get_effective_rules(request)
+            self.assertIs(get_effective_rules(request), rules)
+        self.assertEqual(rules.mask("Order"), READ | UPDATE)
+        self.assertTrue(rules.has_role("admin"))
+        self.assertFalse(rules.has("Product", READ))
+
+    def test_each_request_resolves_roles_again(self):
+        first = get_effective_rules(self._request())
+        self.user.roles.remove(self.role_admin)
+        second = get_effective_rules(self._request())
+        self.assertTrue(first.has_role("admin"))
+        self.assertFalse(second.has_role("admin"))
+
+    def test_order_detail_resolves_roles_once(self):
+        order = Order.objects.create(user=self.user, status="pending")
+        self.client.force_authenticate(user=self.user)
+        url = reverse("shop:order-detail", kwargs={"pk": order.pk})
+        # Roles, the order itself and its items.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_admin_permission_uses_memoized_roles(self):
+        self.client.force_authenticate(user=self.user)
+        # Roles and the access rule list.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("shop:accessrule-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -16,6 +16,18 @@ class TestJWTUtils(unittest.TestCase):
         )
         self.assertIsInstance(token, str)
 
+    def test_encode_jwt_embeds_roles_and_version(self):
+        token = encode_jwt(
+            self.user_payload,
+            secret=self.secret_key,
+            algorithm=self.algorithm,
+            roles=[1, 2],
+            auth_version=3,
+        )
+        payload = decode_jwt(token, secret=self.secret_key, algorithms=[self.algorithm])
+        self.assertEqual(payload["roles"], [1, 2])
+        self.assertEqual(payload["ver"], 3)
+
     def test_decode_jwt_returns_payload(self):
         token = jwt.encode(
             {**self.user_payload, "exp": datetime.utcnow() + timedelta(hours=1)},
@@ -0,0 +1,82 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import (
+    User,
+    Role,
+    BusinessElement,
+    AccessRule,
+    Category,
+    Product,
+    Order,
+    OrderItem,
+    Cart,
+    CartItem,
+)
+from shop.serializers import CartSerializer, OrderSerializer
+from shop.tests.utils import assert_no_lazy_loads
+from shop.views import CartViewSet, OrderViewSet, UserViewSet
+from users.serializers import UserWithRolesSerializer
+
+
+class NestedRelationsTest(APITestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name="admin")
+        AccessRule.objects.create(
+            role=self.role,
+            business_element=BusinessElement.objects.create(name="Order"),
+            read_permission=True,
+            read_all_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="nested@example.com", password="nestedpass"
+        )
+        self.user.roles.add(self.role)
+        category = Category.objects.create(name="Books")
+        self.products = [
+            Product.objects.create(name=f"Book {i}", category=category, price=10)
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def _create_orders(self, count):
+        for _ in range(count):
+            order = Order.objects.create(user=self.user)
+            for product in self.products:
+                OrderItem.objects.create(order=order, product=product)
+
+    def test_order_serializer_with_prefetch_has_no_lazy_loads(self):
+        self._create_orders(2)
+        orders = list(
+            Order.objects.prefetch_related(*OrderViewSet.prefetch_related_fields)
+        )
+        data = assert_no_lazy_loads(OrderSerializer(orders, many=True))
+        self.assertEqual(len(data[0]["items"]), 3)
+
+    def test_helper_reports_lazy_loads(self):
+        self._create_orders(1)
+        with self.assertRaises(AssertionError):
+            assert_no_lazy_loads(OrderSerializer(list(Order.objects.all()), many=True))
+
+    def test_cart_and_user_serializers_have_no_lazy_loads(self):
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=cart, product=self.products[0])
+        carts = list(Cart.objects.prefetch_related(*CartViewSet.prefetch_related_fields))
+        assert_no_lazy_loads(CartSerializer(carts, many=True))
+
+        users = list(User.objects.prefetch_related(*UserViewSet.prefetch_related_fields))
+        assert_no_lazy_loads(UserWithRolesSerializer(users, many=True))
+
+    def test_order_list_query_count_does_not_grow_with_orders(self):
+        url = reverse("shop:order-list")
+        self._create_orders(1)
+        self.client.get(url)
+        # Roles, the order page and its prefetched items.
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        self._create_orders(5)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 6)
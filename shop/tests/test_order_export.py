@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import (
+    User,
+    Role,
+    BusinessElement,
+    AccessRule,
+    Category,
+    Product,
+    Order,
+    OrderItem,
+)
+from shop.utils.order_export import export_orders
+
+
+class OrderExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="buyer@example.com", password="buyerpass"
+        )
+        category = Category.objects.create(name="Books")
+        self.novel = Product.objects.create(
+            sku="A-1", name="Novel", category=category, price=10
+        )
+        self.poems = Product.objects.create(name="Poems", category=category, price=5)
+        self.orders = [Order.objects.create(user=self.user) for _ in range(5)]
+        for order in self.orders:
+            OrderItem.objects.create(order=order, product=self.novel, quantity=2)
+            OrderItem.objects.create(order=order, product=self.poems, quantity=1)
+        self.empty = Order.objects.create(user=self.user, status="canceled")
+
+    def test_csv_has_one_line_per_item(self):
+        rows = list(
+            csv.reader("".join(export_orders(Order.objects.all(), "csv")).splitlines())
+        )
+        self.assertEqual(rows[0][:2], ["order_id", "user_id"])
+        self.assertEqual(len(rows), 1 + 5 * 2 + 1)
+        self.assertEqual(rows[1][5:9], [str(self.novel.id), "A-1", "Novel", "2"])
+        self.assertEqual(rows[-1][2:3] + rows[-1][5:], ["canceled"] + [""] * 5)
+
+    def test_jsonl_nests_items(self):
+        lines = list(export_orders(Order.objects.all(), "jsonl"))
+        self.assertEqual(len(lines), 6)
+        first = json.loads(lines[0])
+        self.assertEqual(first["id"], self.orders[0].id)
+        self.assertEqual(
+            [item["product_name"] for item in first["items"]], ["Novel", "Poems"]
+        )
+
+    def test_loads_items_and_products_per_chunk(self):
+        lines = export_orders(Order.objects.all(), "jsonl", chunk_size=2)
+        # One query streaming the orders, plus one for the items joined with
+        # products of each chunk of two orders.
+        with self.assertNumQueries(4):
+            self.assertEqual(len(list(lines)), 6)
+
+    def test_command_filters_and_writes_output(self):
+        Order.objects.filter(id=self.orders[0].id).update(
+            created_at=timezone.now() - timedelta(days=40)
+        )
+        out = io.StringIO()
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        call_command(
+            "export_orders",
+            "--format=jsonl",
+            "--status=pending",
+            f"--since={since}",
+            stdout=out,
+        )
+        ids = [json.loads(line)["id"] for line in out.getvalue().splitlines()]
+        self.assertEqual(ids, [order.id for order in self.orders[1:]])
+
+
+class OrderExportAPITest(APITestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name="user")
+        self.rule = AccessRule.objects.create(
+            role=self.role,
+            business_element=BusinessElement.objects.create(name="Order"),
+            read_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="buyer@example.com", password="buyerpass"
+        )
+        self.user.roles.add(self.role)
+        self.other = User.objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        self.own = Order.objects.create(user=self.user)
+        self.foreign = Order.objects.create(user=self.other)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("shop:order-export")
+
+    def exported_ids(self, response):
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line)["id"] for line in content.splitlines()]
+
+    def test_streams_only_visible_orders(self):
+        response = self.client.get(self.url, {"file_format": "jsonl"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(self.exported_ids(response), [self.own.id])
+
+        self.rule.read_all_permission = True
+        self.rule.save()
+        response = self.client.get(self.url, {"file_format": "jsonl"})
+        self.assertEqual(self.exported_ids(response), [self.own.id, self.foreign.id])
+
+    def test_csv_is_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_rejects_unknown_format(self):
+        response = self.client.get(self.url, {"file_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
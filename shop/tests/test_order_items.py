@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from shop.models import User, Category, Product, Order, OrderItem
+from shop.serializers import OrderSerializer
+
+
+class OrderSerializerItemsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="items@example.com", password="itemspass"
+        )
+        category = Category.objects.create(name="Books")
+        self.products = [
+            Product.objects.create(name=f"Book {i}", category=category, price=10)
+            for i in range(4)
+        ]
+
+    def _items(self, *pairs):
+        return [
+            {"product": self.products[index].id, "quantity": quantity}
+            for index, quantity in pairs
+        ]
+
+    def _save(self, data, instance=None):
+        serializer = OrderSerializer(instance, data=data, partial=instance is not None)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_create_inserts_items_in_one_query(self):
+        data = {"user": self.user.id, "items": self._items((0, 1), (1, 2), (2, 3))}
+        serializer = OrderSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            order = serializer.save()
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        # The order itself and a single bulk insert of its items.
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(order.items.count(), 3)
+
+    def test_update_only_writes_changed_lines(self):
+        order = self._save(
+            {"user": self.user.id, "items": self._items((0, 1), (1, 2), (2, 3))}
+        )
+        unchanged = OrderItem.objects.get(order=order, product=self.products[0])
+        changed = OrderItem.objects.get(order=order, product=self.products[1])
+
+        self._save({"items": self._items((0, 1), (1, 5), (3, 1))}, instance=order)
+
+        items = {
+            item.product_id: item for item in OrderItem.objects.filter(order=order)
+        }
+        self.assertEqual(
+            set(items), {self.products[0].id, self.products[1].id, self.products[3].id}
+        )
+        self.assertEqual(items[self.products[0].id].pk, unchanged.pk)
+        self.assertEqual(items[self.products[1].id].pk, changed.pk)
+        self.assertEqual(items[self.products[1].id].quantity, 5)
+        self.assertEqual(items[self.products[3].id].quantity, 1)
+
+    def test_update_without_items_keeps_them(self):
+        order = self._save({"user": self.user.id, "items": self._items((0, 1))})
+        self._save({"status": "processing"}, instance=order)
+        self.assertEqual(order.items.count(), 1)
+
+    def test_duplicate_products_are_rejected(self):
+        serializer = OrderSerializer(
+            data={"user": self.user.id, "items": self._items((0, 1), (0, 2))}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("items", serializer.errors)
+        self.assertEqual(Order.objects.count(), 0)
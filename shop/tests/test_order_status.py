@@ -0,0 +1,153 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import AccessRule, BusinessElement, Order, Role, User
+from shop.serializers import OrderSerializer
+from shop.utils.order_status import transition_order
+from shop.utils.permission_matrix import invalidate_matrix
+
+
+class TransitionOrderTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="status@example.com", password="statuspass"
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def _status(self):
+        self.order.refresh_from_db()
+        return self.order.status
+
+    def test_follows_allowed_transitions(self):
+        self.assertTrue(transition_order(self.order.id, "process"))
+        self.assertEqual(self._status(), "processing")
+        self.assertTrue(transition_order(self.order.id, "complete"))
+        self.assertEqual(self._status(), "completed")
+
+    def test_rejects_transition_from_wrong_status(self):
+        self.assertFalse(transition_order(self.order.id, "complete"))
+        self.assertEqual(self._status(), "pending")
+        transition_order(self.order.id, "cancel")
+        self.assertFalse(transition_order(self.order.id, "process"))
+        self.assertEqual(self._status(), "canceled")
+
+    def test_second_of_two_racing_transitions_fails(self):
+        self.assertTrue(transition_order(self.order.id, "process"))
+        self.assertFalse(transition_order(self.order.id, "process"))
+
+    def test_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            transition_order(self.order.id, "cancel")
+
+    def test_owner_restriction(self):
+        other = User.objects.create_user(email="other@example.com", password="x")
+        self.assertFalse(transition_order(self.order.id, "process", user_id=other.id))
+        self.assertTrue(
+            transition_order(self.order.id, "process", user_id=self.user.id)
+        )
+
+    def test_new_orders_start_pending(self):
+        serializer = OrderSerializer(data={"user": self.user.id, "status": "completed"})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("status", serializer.errors)
+
+    def test_serializer_status_change_runs_transition(self):
+        serializer = OrderSerializer(
+            self.order, data={"status": "pending"}, partial=True
+        )
+        self.assertFalse(serializer.is_valid())
+
+        serializer = OrderSerializer(
+            self.order, data={"status": "processing"}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        with CaptureQueriesContext(connection) as queries:
+            serializer.save()
+        self.assertEqual(self._status(), "processing")
+        # One conditional UPDATE inside the savepoint, no SELECT.
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertEqual(statements.count("UPDATE"), 1)
+        self.assertNotIn("SELECT", statements)
+
+
+class OrderTransitionViewTest(APITestCase):
+    def setUp(self):
+        element = BusinessElement.objects.create(name="Order")
+        customer_role = Role.objects.create(name="user")
+        AccessRule.objects.create(
+            role=customer_role,
+            business_element=element,
+            read_permission=True,
+            update_permission=True,
+        )
+        manager_role = Role.objects.create(name="manager")
+        AccessRule.objects.create(
+            role=manager_role,
+            business_element=element,
+            update_permission=True,
+            update_all_permission=True,
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", password="customerpass"
+        )
+        self.customer.roles.add(customer_role)
+        self.other = User.objects.create_user(
+            email="other@example.com", password="otherpass"
+        )
+        self.other.roles.add(customer_role)
+        self.manager = User.objects.create_user(
+            email="manager@example.com", password="managerpass"
+        )
+        self.manager.roles.add(manager_role)
+        self.order = Order.objects.create(user=self.customer)
+        self.client.force_authenticate(user=self.customer)
+
+    def _post(self, name, pk=None):
+        return self.client.post(
+            reverse(
+                f"shop:order-{name}", kwargs={"pk": self.order.pk if pk is None else pk}
+            )
+        )
+
+    def test_owner_can_cancel(self):
+        response = self._post("cancel")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"id": self.order.pk, "status": "canceled"})
+
+    def test_disallowed_transition_conflicts(self):
+        response = self._post("complete")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["status"], "pending")
+
+    def test_patch_status_conflicts_like_transition(self):
+        transition_order(self.order.id, "cancel")
+        response = self.client.patch(
+            reverse("shop:order-detail", kwargs={"pk": self.order.pk}),
+            {"status": "processing"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["status"], "canceled")
+
+    def test_other_users_order_requires_update_all(self):
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self._post("process").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.manager)
+        self.assertEqual(self._post("process").status_code, status.HTTP_200_OK)
+        self.assertEqual(self._post("complete").status_code, status.HTTP_200_OK)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "completed")
+
+    def test_missing_order(self):
+        self.assertEqual(
+            self._post("process", pk=0).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_requires_update_permission(self):
+        AccessRule.objects.filter(role__name="user").update(update_permission=False)
+        invalidate_matrix()
+        self.assertEqual(self._post("cancel").status_code, status.HTTP_403_FORBIDDEN)
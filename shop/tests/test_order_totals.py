@@ -0,0 +1,101 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from shop.models import User, Category, Product, Order, OrderItem
+from shop.serializers import OrderSerializer
+
+
+class OrderTotalsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="totals@example.com", password="totalspass"
+        )
+        category = Category.objects.create(name="Books")
+        self.novel = Product.objects.create(
+            name="Novel", category=category, price="12.50"
+        )
+        self.poems = Product.objects.create(name="Poems", category=category, price=4)
+        self.atlas = Product.objects.create(name="Atlas", category=category, price=30)
+
+    def _save(self, data, instance=None):
+        serializer = OrderSerializer(instance, data=data, partial=instance is not None)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_create_snapshots_prices_and_totals(self):
+        order = self._save(
+            {
+                "user": self.user.id,
+                "items": [
+                    {"product": self.novel.id, "quantity": 2},
+                    {"product": self.poems.id, "quantity": 1},
+                ],
+            }
+        )
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal("29.00"))
+        self.assertEqual(order.item_count, 3)
+        self.assertEqual(
+            OrderItem.objects.get(order=order, product=self.novel).unit_price,
+            Decimal("12.50"),
+        )
+        self.assertEqual(OrderSerializer(order).data["total_amount"], "29.00")
+
+    def test_update_keeps_ordered_prices(self):
+        order = self._save(
+            {"user": self.user.id, "items": [{"product": self.novel.id, "quantity": 1}]}
+        )
+        self.novel.price = 20
+        self.novel.save()
+
+        self._save(
+            {
+                "items": [
+                    {"product": self.novel.id, "quantity": 2},
+                    {"product": self.atlas.id, "quantity": 1},
+                ]
+            },
+            instance=order,
+        )
+
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal("55.00"))
+        self.assertEqual(order.item_count, 3)
+
+    def test_status_update_leaves_totals_alone(self):
+        order = self._save(
+            {"user": self.user.id, "items": [{"product": self.atlas.id, "quantity": 1}]}
+        )
+        self._save({"status": "processing"}, instance=order)
+        order.refresh_from_db()
+        self.assertEqual(order.total_amount, Decimal("30.00"))
+
+    def test_totals_are_read_only(self):
+        order = self._save(
+            {"user": self.user.id, "total_amount": "1.00", "item_count": 99}
+        )
+        order.refresh_from_db()
+        self.assertEqual((order.total_amount, order.item_count), (0, 0))
+
+    def test_backfill_command(self):
+        legacy = Order.objects.create(user=self.user)
+        OrderItem.objects.create(order=legacy, product=self.novel, quantity=2)
+        OrderItem.objects.create(
+            order=legacy, product=self.poems, quantity=1, unit_price=3
+        )
+        empty = Order.objects.create(user=self.user, total_amount=5, item_count=1)
+
+        call_command("backfill_order_totals", "--chunk-size=1", stdout=StringIO())
+
+        legacy.refresh_from_db()
+        empty.refresh_from_db()
+        self.assertEqual(legacy.total_amount, Decimal("28.00"))
+        self.assertEqual(legacy.item_count, 3)
+        self.assertEqual((empty.total_amount, empty.item_count), (0, 0))
+        self.assertFalse(OrderItem.objects.filter(unit_price__isnull=True).exists())
+
+    def test_created_at_is_read_only(self):
+        order = self._save({"user": self.user.id, "created_at": "2000-01-01T00:00:00Z"})
+        order.refresh_from_db()
+        self.assertGreater(order.created_at.year, 2000)
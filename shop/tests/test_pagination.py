@@ -0,0 +1,72 @@
+from unittest import mock
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import (
+    User,
+    Role,
+    BusinessElement,
+    AccessRule,
+    Category,
+    Product,
+    Order,
+)
+from shop.pagination import IdCursorPagination
+
+
+class CursorPaginationTest(APITestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name="reader")
+        for name in ["Product", "Order"]:
+            AccessRule.objects.create(
+                role=self.role,
+                business_element=BusinessElement.objects.create(name=name),
+                read_permission=True,
+                read_all_permission=True,
+            )
+        self.user = User.objects.create_user(
+            email="pager@example.com", password="pagerpass"
+        )
+        self.user.roles.add(self.role)
+        self.category = Category.objects.create(name="Books")
+        self.products = [
+            Product.objects.create(name=f"Book {i}", category=self.category, price=10)
+            for i in range(5)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def test_products_are_paged_by_id(self):
+        url = reverse("shop:product-list")
+        response = self.client.get(url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [p.id for p in self.products[:2]],
+        )
+
+        seen = [item["id"] for item in response.data["results"]]
+        next_url = response.data["next"]
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [item["id"] for item in response.data["results"]]
+            next_url = response.data["next"]
+        self.assertEqual(seen, [p.id for p in self.products])
+
+    def test_page_size_is_capped(self):
+        url = reverse("shop:product-list")
+        with mock.patch.object(IdCursorPagination, "max_page_size", 3):
+            response = self.client.get(url, {"page_size": 10})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_orders_are_paged_newest_first(self):
+        orders = [Order.objects.create(user=self.user) for _ in range(3)]
+        response = self.client.get(reverse("shop:order-list"), {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [orders[2].id, orders[1].id],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]], [orders[0].id]
+        )
@@ -0,0 +1,96 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from rest_framework import status
+from shop.models import User, Role, BusinessElement, AccessRule, Category
+from shop.utils import permission_matrix
+from shop.utils.permission_matrix import (
+    get_matrix,
+    invalidate_matrix,
+    READ,
+    CREATE,
+    UPDATE,
+    DELETE_ALL,
+)
+
+
+class PermissionMatrixTest(TestCase):
+    def setUp(self):
+        self.role_admin = Role.objects.create(name="admin")
+        self.role_user = Role.objects.create(name="user")
+        self.element_category = BusinessElement.objects.create(name="Category")
+        self.rule = AccessRule.objects.create(
+            role=self.role_admin,
+            business_element=self.element_category,
+            read_permission=True,
+            create_permission=True,
+            delete_all_permission=True,
+        )
+
+    def test_compiles_rule_flags_into_mask(self):
+        matrix = get_matrix()
+        self.assertEqual(
+            matrix.get_mask(self.role_admin.id, "Category"),
+            READ | CREATE | DELETE_ALL,
+        )
+        self.assertIsNone(matrix.get_mask(self.role_user.id, "Category"))
+        self.assertEqual(matrix.role_names[self.role_user.id], "user")
+
+    def test_compiles_with_single_query(self):
+        invalidate_matrix()
+        with self.assertNumQueries(1):
+            get_matrix()
+        with self.assertNumQueries(0):
+            get_matrix()
+
+    def test_rule_save_invalidates_matrix(self):
+        get_matrix()
+        self.rule.update_permission = True
+        self.rule.save()
+        self.assertIsNone(permission_matrix._matrix)
+        self.assertTrue(
+            get_matrix().get_mask(self.role_admin.id, "Category") & UPDATE
+        )
+
+    def test_rule_delete_invalidates_matrix(self):
+        get_matrix()
+        self.rule.delete()
+        self.assertIsNone(get_matrix().get_mask(self.role_admin.id, "Category"))
+
+    def test_role_rename_invalidates_matrix(self):
+        get_matrix()
+        self.role_user.name = "customer"
+        self.role_user.save()
+        self.assertEqual(get_matrix().role_names[self.role_user.id], "customer")
+
+    def test_business_element_delete_invalidates_matrix(self):
+        get_matrix()
+        self.element_category.delete()
+        self.assertEqual(get_matrix().masks, {})
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class PermissionMatrixQueryCountTest(APITestCase):
+    def setUp(self):
+        self.element_category = BusinessElement.objects.create(name="Category")
+        self.user = User.objects.create_user(
+            email="reader@example.com", password="readerpass"
+        )
+        for name in ["user", "manager", "auditor"]:
+            role = Role.objects.create(name=name)
+            AccessRule.objects.create(
+                role=role,
+                business_element=self.element_category,
+                read_permission=name == "auditor",
+            )
+            self.user.roles.add(role)
+        Category.objects.create(name="Books")
+        self.client.force_authenticate(user=self.user)
+
+    def test_permission_check_does_not_query_rules_when_warm(self):
+        url = reverse("shop:category-list")
+        self.client.get(url)
+        # One query for the user's roles, one for the category list.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
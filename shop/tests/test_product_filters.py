@@ -0,0 +1,88 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category, Product
+
+
+class ProductFilterTest(APITestCase):
+    def setUp(self):
+        self.role = Role.objects.create(name="user")
+        AccessRule.objects.create(
+            role=self.role,
+            business_element=BusinessElement.objects.create(name="Product"),
+            read_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="shopper@example.com", password="shopperpass"
+        )
+        self.user.roles.add(self.role)
+        self.books = Category.objects.create(name="Books")
+        self.music = Category.objects.create(name="Music")
+        for name, category, price in [
+            ("Novel", self.books, "12.00"),
+            ("Notebook", self.books, "3.50"),
+            ("Poems", self.books, "7.00"),
+            ("Nocturnes", self.music, "20.00"),
+            ("Opera", self.music, "7.00"),
+        ]:
+            Product.objects.create(name=name, category=category, price=price)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("shop:product-list")
+
+    def names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [product["name"] for product in response.data["results"]]
+
+    def test_filters_by_category_and_price_range(self):
+        self.assertEqual(
+            self.names(category=self.books.id), ["Novel", "Notebook", "Poems"]
+        )
+        self.assertEqual(
+            self.names(category=self.books.id, min_price="5", max_price="12"),
+            ["Novel", "Poems"],
+        )
+        self.assertEqual(self.names(min_price="15"), ["Nocturnes"])
+
+    def test_filters_by_name_prefix(self):
+        self.assertEqual(self.names(name="No"), ["Novel", "Notebook", "Nocturnes"])
+        self.assertEqual(self.names(name="Op"), ["Opera"])
+
+    def test_orders_by_price_and_name(self):
+        self.assertEqual(
+            self.names(ordering="price"),
+            ["Notebook", "Poems", "Opera", "Novel", "Nocturnes"],
+        )
+        self.assertEqual(
+            self.names(ordering="-price"),
+            ["Nocturnes", "Novel", "Poems", "Opera", "Notebook"],
+        )
+        self.assertEqual(
+            self.names(ordering="name", category=self.music.id),
+            ["Nocturnes", "Opera"],
+        )
+
+    def test_price_ordering_pages_through_ties(self):
+        seen = []
+        response = self.client.get(self.url, {"ordering": "price", "page_size": 2})
+        while True:
+            seen += [product["name"] for product in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, ["Notebook", "Poems", "Opera", "Novel", "Nocturnes"])
+
+    def test_unknown_ordering_field_is_ignored(self):
+        self.assertEqual(
+            self.names(ordering="category"),
+            ["Novel", "Notebook", "Poems", "Nocturnes", "Opera"],
+        )
+
+    def test_invalid_filters_return_400(self):
+        for params in [
+            {"min_price": "cheap"},
+            {"category": "books"},
+            {"min_price": "10", "max_price": "5"},
+        ]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
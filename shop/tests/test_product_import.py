@@ -0,0 +1,126 @@
+import io
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category, Product
+from shop.utils.product_import import import_products
+
+CSV_FEED = """sku,name,category,price
+A-1,Novel,Books,12.50
+A-2,Poems,Books,7
+B-1,Nocturnes,Music,20
+"""
+
+
+class ImportProductsTest(TestCase):
+    def setUp(self):
+        self.books = Category.objects.create(name="Books")
+        self.music = Category.objects.create(name="Music")
+
+    def test_upserts_by_sku(self):
+        Product.objects.create(sku="A-1", name="Old", category=self.music, price=1)
+
+        result = import_products(io.StringIO(CSV_FEED), "csv")
+
+        self.assertEqual(result, {"imported": 3, "failed": 0, "errors": []})
+        self.assertEqual(Product.objects.count(), 3)
+        novel = Product.objects.get(sku="A-1")
+        self.assertEqual(
+            (novel.name, novel.category, str(novel.price)),
+            ("Novel", self.books, "12.50"),
+        )
+
+    def test_one_category_lookup_and_one_upsert_per_chunk(self):
+        with CaptureQueriesContext(connection) as context:
+            import_products(io.StringIO(CSV_FEED), "csv", chunk_size=2)
+        statements = [
+            query["sql"].split()[0]
+            for query in context.captured_queries
+            if query["sql"].startswith(("SELECT", "INSERT"))
+        ]
+        self.assertEqual(statements, ["SELECT", "INSERT"] * 2)
+
+    def test_reports_invalid_rows_and_imports_the_rest(self):
+        feed = "\n".join(
+            [
+                '{"sku": "A-1", "name": "Novel", "category": "Books", "price": "12"}',
+                '{"sku": "A-2", "name": "Poems", "category": "Books", "price": "x"}',
+                "not json",
+                "",
+                '{"sku": "C-1", "name": "Atlas", "category": "Maps", "price": "3"}',
+            ]
+        )
+
+        result = import_products(io.StringIO(feed), "jsonl")
+
+        self.assertEqual(result["imported"], 1)
+        self.assertEqual(result["failed"], 3)
+        self.assertEqual([error["line"] for error in result["errors"]], [2, 3, 5])
+        self.assertIn("price", result["errors"][0]["errors"])
+        self.assertEqual(list(Product.objects.values_list("sku", flat=True)), ["A-1"])
+
+    def test_duplicate_skus_in_a_chunk_keep_the_last_row(self):
+        feed = CSV_FEED + "A-1,Novel 2nd ed.,Books,14\n"
+        import_products(io.StringIO(feed), "csv")
+        self.assertEqual(Product.objects.get(sku="A-1").name, "Novel 2nd ed.")
+
+    def test_command_can_create_categories(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as feed:
+            feed.write(CSV_FEED + "C-1,Atlas,Maps,3\n")
+            feed.flush()
+            call_command(
+                "import_products",
+                feed.name,
+                "--create-categories",
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+        self.assertEqual(Product.objects.get(sku="C-1").category.name, "Maps")
+        self.assertEqual(Product.objects.count(), 4)
+
+
+class ProductImportAPITest(APITestCase):
+    def setUp(self):
+        self.element = BusinessElement.objects.create(name="Product")
+        self.role = Role.objects.create(name="supplier")
+        self.rule = AccessRule.objects.create(
+            role=self.role,
+            business_element=self.element,
+            create_permission=True,
+            update_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="supplier@example.com", password="supplierpass"
+        )
+        self.user.roles.add(self.role)
+        Category.objects.create(name="Books")
+        Category.objects.create(name="Music")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("shop:product-bulk-import")
+
+    def upload(self, name="feed.csv", content=CSV_FEED, **data):
+        data["file"] = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, data, format="multipart")
+
+    def test_imports_uploaded_feed(self):
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], 3)
+        self.assertEqual(Product.objects.count(), 3)
+
+    def test_requires_update_permission(self):
+        self.rule.update_permission = False
+        self.rule.save()
+        self.assertEqual(self.upload().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rejects_unknown_format(self):
+        response = self.upload(name="feed.txt")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload(name="feed.txt", format="csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
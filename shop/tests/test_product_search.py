@@ -0,0 +1,133 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category, Product
+from shop.utils.search import (
+    InvertedIndex,
+    PostgresSearchBackend,
+    get_search_backend,
+    product_index,
+    tokenize,
+)
+
+
+class InvertedIndexTest(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Books")
+        self.novel = Product.objects.create(
+            name="Red Novel", category=category, price=10
+        )
+        self.poems = Product.objects.create(
+            name="Red red poems", category=category, price=5
+        )
+        self.atlas = Product.objects.create(
+            name="Blue Atlas", category=category, price=7
+        )
+        self.index = InvertedIndex()
+
+    def test_tokenizes_case_insensitively(self):
+        self.assertEqual(tokenize("Red-Novel, 2nd ed."), ["red", "novel", "2nd", "ed"])
+
+    def test_matches_all_tokens_ranked_by_frequency(self):
+        products = Product.objects.all()
+        self.assertEqual(self.index.search(products, "red novel"), [self.novel.id])
+        self.assertEqual(
+            self.index.search(products, "red"), [self.poems.id, self.novel.id]
+        )
+        self.assertEqual(
+            self.index.search(Product.objects.all(), "ATLAS"), [self.atlas.id]
+        )
+        self.assertEqual(self.index.search(Product.objects.all(), "green"), [])
+
+    def test_incremental_updates(self):
+        self.index.search(Product.objects.all(), "red")
+        self.index.update(self.atlas.id, "Red Atlas")
+        self.index.remove(self.novel.id)
+        self.assertEqual(
+            sorted(self.index.search(Product.objects.all(), "red")),
+            [self.poems.id, self.atlas.id],
+        )
+        self.assertEqual(self.index.search(Product.objects.all(), "blue"), [])
+
+    def test_respects_queryset(self):
+        cheap = Product.objects.filter(price__lt=8)
+        self.assertEqual(self.index.search(cheap, "red"), [self.poems.id])
+        self.assertEqual(self.index.search(cheap, ""), [])
+
+    def test_load_skips_deleted_products(self):
+        ids = self.index.search(Product.objects.all(), "red")
+        self.novel.delete()
+        self.assertEqual(self.index.load(ids), [self.poems])
+
+    @override_settings(SEARCH_INDEX_REBUILD_INTERVAL=0)
+    def test_rebuilds_after_interval(self):
+        self.index.search(Product.objects.all(), "red")
+        Product.objects.filter(id=self.atlas.id).update(name="Red Atlas")
+        self.assertIn(self.atlas.id, self.index.search(Product.objects.all(), "red"))
+
+    def test_backend_follows_database_vendor(self):
+        self.assertIs(get_search_backend(), product_index)
+        with mock.patch(
+            "django.db.backends.sqlite3.base.DatabaseWrapper.vendor", "postgresql"
+        ):
+            self.assertIsInstance(get_search_backend(), PostgresSearchBackend)
+
+
+@override_settings(RESPONSE_CACHE_TTL=0)
+class ProductSearchAPITest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        product_index.reset()
+        self.role = Role.objects.create(name="user")
+        AccessRule.objects.create(
+            role=self.role,
+            business_element=BusinessElement.objects.create(name="Product"),
+            read_permission=True,
+        )
+        self.user = User.objects.create_user(
+            email="searcher@example.com", password="searcherpass"
+        )
+        self.user.roles.add(self.role)
+        self.category = Category.objects.create(name="Books")
+        for name in ["Red Novel", "Red red poems", "Blue Atlas"]:
+            Product.objects.create(name=name, category=self.category, price=10)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("shop:product-search")
+
+    def test_returns_ranked_pages(self):
+        response = self.client.get(self.url, {"q": "red", "page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["name"], "Red red poems")
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["name"], "Red Novel")
+        self.assertIsNone(response.data["next"])
+
+    def test_multiple_words_match_all_of_them(self):
+        response = self.client.get(self.url, {"q": "red novel"})
+        self.assertEqual(
+            [product["name"] for product in response.data["results"]], ["Red Novel"]
+        )
+
+    def test_sees_products_saved_after_the_index_was_built(self):
+        self.client.get(self.url, {"q": "atlas"})
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name="Road Atlas", category=self.category, price=3)
+        response = self.client.get(self.url, {"q": "atlas"})
+        self.assertEqual(response.data["count"], 2)
+
+    def test_requires_query(self):
+        response = self.client.get(self.url, {"q": " "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_read_permission(self):
+        stranger = User.objects.create_user(
+            email="stranger@example.com", password="strangerpass"
+        )
+        self.client.force_authenticate(user=stranger)
+        response = self.client.get(self.url, {"q": "red"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
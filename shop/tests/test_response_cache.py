@@ -0,0 +1,118 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category, Product
+
+
+@override_settings(RESPONSE_CACHE_TTL=60)
+class CatalogResponseCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.role = Role.objects.create(name="user")
+        for name in ["Category", "Product"]:
+            AccessRule.objects.create(
+                role=self.role,
+                business_element=BusinessElement.objects.create(name=name),
+                read_permission=True,
+            )
+        self.user = User.objects.create_user(
+            email="reader@example.com", password="readerpass"
+        )
+        self.user.roles.add(self.role)
+        self.category = Category.objects.create(name="Books")
+        self.product = Product.objects.create(
+            name="Novel", category=self.category, price=10
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get_catalog_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        tables = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"shop_product"' in query["sql"] or '"shop_category"' in query["sql"]
+        ]
+        return response, tables
+
+    def test_hit_skips_query_and_serialization(self):
+        url = reverse("shop:product-list")
+        first, queries = self.get_catalog_queries(url)
+        self.assertTrue(queries)
+
+        second, queries = self.get_catalog_queries(url)
+        self.assertEqual(queries, [])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.json()["results"][0]["name"], "Novel")
+
+    def test_detail_is_cached(self):
+        url = reverse("shop:product-detail", args=[self.product.id])
+        self.get_catalog_queries(url)
+        response, queries = self.get_catalog_queries(url)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.json()["id"], self.product.id)
+
+    def test_query_params_are_part_of_the_key(self):
+        Product.objects.create(name="Poems", category=self.category, price=5)
+        url = reverse("shop:product-list")
+        self.get_catalog_queries(url)
+        response, queries = self.get_catalog_queries(url, page_size=1)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_save_and_delete_invalidate(self):
+        url = reverse("shop:product-list")
+        self.get_catalog_queries(url)
+
+        self.product.name = "Essay"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+        response, _ = self.get_catalog_queries(url)
+        self.assertEqual(response.json()["results"][0]["name"], "Essay")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.delete()
+        response, _ = self.get_catalog_queries(url)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_new_category_invalidates_category_list(self):
+        url = reverse("shop:category-list")
+        self.get_catalog_queries(url)
+        Category.objects.create(name="Music")
+        response, _ = self.get_catalog_queries(url)
+        self.assertEqual(
+            [category["name"] for category in response.json()["results"]],
+            ["Books"],
+            "invalidated before the write is committed",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(name="Poetry")
+        response, _ = self.get_catalog_queries(url)
+        self.assertEqual(
+            [category["name"] for category in response.json()["results"]],
+            ["Books", "Music", "Poetry"],
+        )
+
+    def test_permissions_run_before_cached_body(self):
+        url = reverse("shop:product-list")
+        self.get_catalog_queries(url)
+
+        stranger = User.objects.create_user(
+            email="stranger@example.com", password="strangerpass"
+        )
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(RESPONSE_CACHE_TTL=0)
+    def test_disabled_with_zero_ttl(self):
+        url = reverse("shop:product-list")
+        self.get_catalog_queries(url)
+        _, queries = self.get_catalog_queries(url)
+        self.assertEqual(len(queries), 1)
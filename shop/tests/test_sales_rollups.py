@@ -0,0 +1,271 @@
+import re
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+from shop.models import (
+    AccessRule,
+    BusinessElement,
+    Category,
+    DailyCategorySales,
+    DailyProductSales,
+    Order,
+    Product,
+    Role,
+    User,
+)
+from shop.serializers import OrderSerializer
+from shop.utils.order_status import StatusConflict, transition_order
+
+
+def save_order(data, instance=None):
+    serializer = OrderSerializer(instance, data=data, partial=instance is not None)
+    serializer.is_valid(raise_exception=True)
+    return serializer.save()
+
+
+# Transitions leading from "pending" to each status.
+TRANSITION_PATHS = {
+    "pending": [],
+    "processing": ["process"],
+    "completed": ["process", "complete"],
+}
+
+
+def place_order(user, items, status="pending"):
+    order = save_order({"user": user.id, "items": items})
+    for name in TRANSITION_PATHS[status]:
+        transition_order(order.id, name)
+    order.refresh_from_db()
+    return order
+
+
+class SalesRollupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="rollup@example.com", password="rolluppass"
+        )
+        self.books = Category.objects.create(name="Books")
+        self.maps = Category.objects.create(name="Maps")
+        self.novel = Product.objects.create(name="Novel", category=self.books, price=10)
+        self.poems = Product.objects.create(name="Poems", category=self.books, price=4)
+        self.atlas = Product.objects.create(name="Atlas", category=self.maps, price=30)
+        self.today = timezone.localdate()
+
+    def _order(self, status="pending", items=None):
+        return place_order(
+            self.user,
+            items
+            or [
+                {"product": self.novel.id, "quantity": 2},
+                {"product": self.poems.id, "quantity": 1},
+                {"product": self.atlas.id, "quantity": 1},
+            ],
+            status,
+        )
+
+    def _category_rows(self):
+        return {
+            row.category_id: (row.revenue, row.units, row.orders)
+            for row in DailyCategorySales.objects.filter(day=self.today)
+        }
+
+    def _product_rows(self):
+        return {
+            row.product_id: (row.revenue, row.units, row.orders)
+            for row in DailyProductSales.objects.filter(day=self.today)
+        }
+
+    def test_pending_orders_are_not_rolled_up(self):
+        self._order()
+        self.assertFalse(DailyCategorySales.objects.exists())
+        self.assertFalse(DailyProductSales.objects.exists())
+
+    def test_completing_an_order_adds_it(self):
+        order = self._order("processing")
+        save_order({"status": "completed"}, instance=order)
+        self._order("completed", [{"product": self.novel.id, "quantity": 1}])
+
+        self.assertEqual(
+            self._category_rows(),
+            {
+                self.books.id: (Decimal("34.00"), 4, 2),
+                self.maps.id: (Decimal("30.00"), 1, 1),
+            },
+        )
+        self.assertEqual(self._product_rows()[self.novel.id], (Decimal("30.00"), 3, 2))
+
+    def test_rolled_up_prices_are_the_ordered_ones(self):
+        order = self._order("processing")
+        self.novel.price = 100
+        self.novel.save()
+        save_order({"status": "completed"}, instance=order)
+        self.assertEqual(self._product_rows()[self.novel.id][0], Decimal("20.00"))
+
+    def test_complete_transition_adds_it(self):
+        order = self._order("processing")
+        self.assertTrue(transition_order(order.id, "complete"))
+        self.assertEqual(self._product_rows()[self.novel.id], (Decimal("20.00"), 2, 1))
+
+    def test_items_of_completed_order_are_frozen(self):
+        order = self._order("completed")
+        before = self._category_rows()
+        with self.assertRaises(ValidationError):
+            save_order(
+                {"items": [{"product": self.atlas.id, "quantity": 2}]},
+                instance=order,
+            )
+        self.assertEqual(order.items.count(), 3)
+        self.assertEqual(self._category_rows(), before)
+
+    def test_deleting_completed_order_removes_it(self):
+        order = self._order("completed")
+        order.delete()
+        self.assertEqual(self._product_rows()[self.atlas.id], (Decimal("0.00"), 0, 0))
+
+    def test_stale_instance_cannot_undo_completion(self):
+        order = self._order("processing")
+        stale = Order.objects.get(pk=order.pk)
+        transition_order(order.pk, "complete")
+
+        serializer = OrderSerializer(stale, data={"status": "canceled"}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(StatusConflict):
+            serializer.save()
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, "completed")
+        self.assertEqual(self._product_rows()[self.novel.id], (Decimal("20.00"), 2, 1))
+
+    def test_item_changes_use_current_status(self):
+        order = self._order("processing")
+        stale = Order.objects.get(pk=order.pk)
+        transition_order(order.pk, "complete")
+
+        with self.assertRaises(ValidationError):
+            save_order({"items": [{"product": self.atlas.id, "quantity": 2}]}, stale)
+        self.assertEqual(order.items.count(), 3)
+
+    def test_rows_are_updated_in_key_order(self):
+        order = self._order(
+            "processing",
+            [
+                {"product": self.atlas.id, "quantity": 1},
+                {"product": self.novel.id, "quantity": 1},
+                {"product": self.poems.id, "quantity": 1},
+            ],
+        )
+        with CaptureQueriesContext(connection) as queries:
+            transition_order(order.id, "complete")
+        touched = [
+            (table, int(key))
+            for table, key in re.findall(
+                r'^UPDATE "shop_daily(product|category)sales" .*_id" = (\d+)',
+                "\n".join(query["sql"] for query in queries),
+                re.MULTILINE,
+            )
+        ]
+        self.assertEqual(
+            touched,
+            sorted(touched, key=lambda row: (row[0] != "product", row[1])),
+        )
+        self.assertEqual(len(touched), 5)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self._order("completed")
+        self._order("completed", [{"product": self.atlas.id, "quantity": 3}])
+        order = self._order("processing")
+        transition_order(order.id, "complete")
+        self._order()
+        expected = (self._category_rows(), self._product_rows())
+
+        DailyCategorySales.objects.all().delete()
+        DailyProductSales.objects.filter(product=self.poems).update(
+            revenue=999, units=9, orders=9
+        )
+        out = StringIO()
+        call_command("rebuild_sales_rollups", stdout=out)
+
+        self.assertEqual((self._category_rows(), self._product_rows()), expected)
+        self.assertIn("Rebuilt 2 category and 3 product rollup rows", out.getvalue())
+
+
+class ReportViewSetTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="adminpass"
+        )
+        self.customer = User.objects.create_user(
+            email="customer@example.com", password="customerpass"
+        )
+        admin_role = Role.objects.create(name="admin")
+        self.admin.roles.add(admin_role)
+        self.customer.roles.add(Role.objects.create(name="user"))
+        AccessRule.objects.create(
+            role=admin_role,
+            business_element=BusinessElement.objects.create(name="Report"),
+            read_permission=True,
+        )
+
+        self.books = Category.objects.create(name="Books")
+        self.maps = Category.objects.create(name="Maps")
+        self.novel = Product.objects.create(name="Novel", category=self.books, price=10)
+        self.atlas = Product.objects.create(name="Atlas", category=self.maps, price=30)
+        self.today = timezone.localdate()
+        place_order(
+            self.customer,
+            [
+                {"product": self.novel.id, "quantity": 5},
+                {"product": self.atlas.id, "quantity": 1},
+            ],
+            "completed",
+        )
+        self.client.force_authenticate(user=self.admin)
+
+    def test_daily_revenue(self):
+        response = self.client.get(reverse("shop:report-daily-revenue"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["category_id"], row["revenue"]) for row in response.json()],
+            [(self.books.id, "50.00"), (self.maps.id, "30.00")],
+        )
+
+        response = self.client.get(
+            reverse("shop:report-daily-revenue"), {"category": self.maps.id}
+        )
+        self.assertEqual([row["units"] for row in response.data], [1])
+
+    def test_top_products(self):
+        response = self.client.get(reverse("shop:report-top-products"), {"limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["product_name"], "Novel")
+        self.assertEqual(response.json()[0]["revenue"], "50.00")
+
+    def test_range_excludes_other_days(self):
+        yesterday = self.today - timedelta(days=1)
+        response = self.client.get(
+            reverse("shop:report-daily-revenue"),
+            {"since": yesterday, "until": yesterday},
+        )
+        self.assertEqual(response.data, [])
+
+    def test_reversed_range_is_rejected(self):
+        response = self.client.get(
+            reverse("shop:report-top-products"),
+            {"since": self.today, "until": self.today - timedelta(days=1)},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_report_access_rule(self):
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(reverse("shop:report-daily-revenue"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,20 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def assert_no_lazy_loads(serializer):
+    """
+    Render ``serializer.data`` and fail if that runs any query, i.e. if a
+    nested field lazily loads a relation that should have been
+    select_related or prefetch_related. Pass already evaluated instances
+    (e.g. ``list(queryset)``) so fetching the objects themselves isn't counted.
+    """
+    with CaptureQueriesContext(connection) as context:
+        data = serializer.data
+    if context.captured_queries:
+        queries = "\n".join(query["sql"] for query in context.captured_queries)
+        raise AssertionError(
+            f"{serializer.__class__.__name__} ran "
+            f"{len(context.captured_queries)} queries while rendering:\n{queries}"
+        )
+    return data
@@ -5,6 +5,7 @@ from .views import (
     CategoryViewSet,
     ProductViewSet,
     OrderViewSet,
+    ReportViewSet,
     AccessRuleViewSet,
     UserViewSet,
 )
@@ -15,6 +16,7 @@ router.register(r"categories", CategoryViewSet)
 router.register(r"products", ProductViewSet)
 router.register(r"orders", OrderViewSet)
 router.register(r"cart", CartViewSet)
+router.register(r"reports", ReportViewSet, basename="report")
 router.register(r"accessrules", AccessRuleViewSet)
 router.register(r"users", UserViewSet)
 
@@ -0,0 +1,46 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from shop.models import Cart, CartItem
+
+
+def get_cart_id(user) -> int:
+    cart, created = Cart.objects.get_or_create(user=user)
+    return cart.id
+
+
+def add_cart_item(cart_id, product_id, quantity) -> int:
+    """
+    Add ``quantity`` of a product to the cart with an atomic increment and
+    return the resulting quantity. Concurrent adds of the same product never
+    lose an increment.
+    """
+    line = CartItem.objects.filter(cart_id=cart_id, product_id=product_id)
+    with transaction.atomic():
+        if not line.update(quantity=F("quantity") + quantity):
+            try:
+                with transaction.atomic():
+                    CartItem.objects.create(
+                        cart_id=cart_id, product_id=product_id, quantity=quantity
+                    )
+                return quantity
+            except IntegrityError:
+                # Another request inserted the line first.
+                line.update(quantity=F("quantity") + quantity)
+        return line.values_list("quantity", flat=True).get()
+
+
+def set_cart_item_quantity(cart_id, product_id, quantity) -> int:
+    CartItem.objects.bulk_create(
+        [CartItem(cart_id=cart_id, product_id=product_id, quantity=quantity)],
+        update_conflicts=True,
+        unique_fields=["cart", "product"],
+        update_fields=["quantity"],
+    )
+    return quantity
+
+
+def remove_cart_item(user, product_id) -> bool:
+    deleted, _ = CartItem.objects.filter(
+        cart__user=user, product_id=product_id
+    ).delete()
+    return bool(deleted)
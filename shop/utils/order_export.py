@@ -0,0 +1,95 @@
+import csv
+import json
+
+from django.db.models import Prefetch
+
+from shop.models import OrderItem
+
+FORMATS = ("csv", "jsonl")
+CONTENT_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+CSV_HEADER = [
+    "order_id",
+    "user_id",
+    "status",
+    "created_at",
+    "total_amount",
+    "product_id",
+    "product_sku",
+    "product_name",
+    "quantity",
+    "unit_price",
+]
+
+
+def iter_orders(queryset, chunk_size=2000):
+    """
+    Yield orders with their items and products loaded, ``chunk_size`` orders
+    at a time: one query for the orders (a server-side cursor where the
+    database supports it) plus one for the items and products of each chunk.
+    """
+    items = Prefetch("items", queryset=OrderItem.objects.select_related("product"))
+    return (
+        queryset.order_by("id").prefetch_related(items).iterator(chunk_size=chunk_size)
+    )
+
+
+def order_as_dict(order):
+    return {
+        "id": order.id,
+        "user_id": order.user_id,
+        "status": order.status,
+        "created_at": order.created_at.isoformat(),
+        "total_amount": str(order.total_amount),
+        "items": [
+            {
+                "product_id": item.product_id,
+                "product_sku": item.product.sku,
+                "product_name": item.product.name,
+                "quantity": item.quantity,
+                "unit_price": None if item.unit_price is None else str(item.unit_price),
+            }
+            for item in order.items.all()
+        ],
+    }
+
+
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(orders):
+    """One line per order item; orders without items get one line."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for order in orders:
+        data = order_as_dict(order)
+        head = [
+            data["id"],
+            data["user_id"],
+            data["status"],
+            data["created_at"],
+            data["total_amount"],
+        ]
+        if not data["items"]:
+            yield writer.writerow(head + [""] * 5)
+        for item in data["items"]:
+            yield writer.writerow(head + list(item.values()))
+
+
+def jsonl_lines(orders):
+    """One JSON object per order with its items nested."""
+    for order in orders:
+        yield json.dumps(order_as_dict(order)) + "\n"
+
+
+def export_orders(queryset, format, chunk_size=2000):
+    """Return a generator of text lines exporting ``queryset`` as ``format``."""
+    orders = iter_orders(queryset, chunk_size)
+    if format == "csv":
+        return csv_lines(orders)
+    if format == "jsonl":
+        return jsonl_lines(orders)
+    raise ValueError(f"Unsupported format {format!r}, expected one of {FORMATS}.")
@@ -0,0 +1,56 @@
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from shop.models import Order
+from shop.utils import sales_rollup
+
+INITIAL_STATUS = "pending"
+
+
+class StatusConflict(APIException):
+    """A transition was requested for an order in a status it can't leave."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_code = "status_conflict"
+
+    def __init__(self, name, current):
+        super().__init__(
+            {
+                "detail": f'Cannot {name} an order in status "{current}".',
+                "status": current,
+            }
+        )
+
+
+def transition_to(target):
+    """Name of the transition that leads to ``target``, or None."""
+    for name, (sources, transition_target) in Order.TRANSITIONS.items():
+        if transition_target == target:
+            return name
+    return None
+
+
+def transition_order(order_id, name, user_id=None) -> bool:
+    """
+    Apply the transition ``name`` to the order with a single conditional
+    UPDATE on its current status, restricted to the orders of ``user_id``
+    when given. Returns False, changing nothing, when no such order is in a
+    status the transition may start from; concurrent transitions of the
+    same order therefore never both succeed.
+    """
+    sources, target = Order.TRANSITIONS[name]
+    orders = Order.objects.filter(pk=order_id, status__in=sources)
+    if user_id is not None:
+        orders = orders.filter(user_id=user_id)
+    if target != sales_rollup.ROLLUP_STATUS:
+        return bool(orders.update(status=target))
+    # No transition leaves the completed status, so rollups only grow.
+    with transaction.atomic():
+        if not orders.update(status=target):
+            return False
+        created_at = (
+            Order.objects.filter(pk=order_id).values_list("created_at", flat=True).get()
+        )
+        sales_rollup.apply_order_items(order_id, created_at)
+    return True
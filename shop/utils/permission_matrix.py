@@ -0,0 +1,106 @@
+import threading
+import time
+
+from django.conf import settings
+
+from shop.models import Role
+
+READ = 1 << 0
+READ_ALL = 1 << 1
+CREATE = 1 << 2
+CREATE_FOR_OTHER_USERS = 1 << 3
+UPDATE = 1 << 4
+UPDATE_ALL = 1 << 5
+DELETE = 1 << 6
+DELETE_ALL = 1 << 7
+
+FLAG_FIELDS = {
+    "read_permission": READ,
+    "read_all_permission": READ_ALL,
+    "create_permission": CREATE,
+    "can_create_for_other_users": CREATE_FOR_OTHER_USERS,
+    "update_permission": UPDATE,
+    "update_all_permission": UPDATE_ALL,
+    "delete_permission": DELETE,
+    "delete_all_permission": DELETE_ALL,
+}
+
+
+class PermissionMatrix:
+    """
+    Compiled snapshot of every AccessRule.
+
+    ``masks`` maps ``(role_id, business_element_name)`` to a bitmask of the
+    flags above, ``role_names`` maps every role id to its name.
+    """
+
+    def __init__(self, masks, role_names):
+        self.masks = masks
+        self.role_names = role_names
+        self.compiled_at = time.monotonic()
+
+    def get_mask(self, role_id, element_name):
+        return self.masks.get((role_id, element_name))
+
+
+_lock = threading.Lock()
+_matrix = None
+_generation = 0
+
+
+def compile_matrix():
+    """
+    Build a PermissionMatrix with a single Role -> AccessRule -> BusinessElement
+    join. Roles without rules are kept so their names are still known.
+    """
+    rule_fields = [f"access_rules__{field}" for field in FLAG_FIELDS]
+    rows = Role.objects.values_list(
+        "id", "name", "access_rules__business_element__name", *rule_fields
+    )
+
+    masks = {}
+    role_names = {}
+    for role_id, role_name, element_name, *flags in rows:
+        role_names[role_id] = role_name
+        if element_name is None:
+            continue
+        mask = 0
+        for flag, enabled in zip(FLAG_FIELDS.values(), flags):
+            if enabled:
+                mask |= flag
+        masks[(role_id, element_name)] = mask
+    return PermissionMatrix(masks, role_names)
+
+
+def _is_expired(matrix):
+    ttl = getattr(settings, "PERMISSION_MATRIX_TTL", None)
+    return ttl is not None and time.monotonic() - matrix.compiled_at > ttl
+
+
+def get_matrix():
+    """
+    Return the process-local PermissionMatrix, compiling it on first use,
+    after invalidation or once PERMISSION_MATRIX_TTL seconds have passed.
+    """
+    global _matrix
+    matrix = _matrix
+    if matrix is not None and not _is_expired(matrix):
+        return matrix
+
+    with _lock:
+        if _matrix is not None and not _is_expired(_matrix):
+            return _matrix
+        generation = _generation
+        matrix = compile_matrix()
+        # Don't publish a matrix that was compiled while an invalidation
+        # arrived; the next caller will compile a fresh one.
+        if generation == _generation:
+            _matrix = matrix
+        return matrix
+
+
+def invalidate_matrix(**kwargs):
+    """Drop the compiled matrix. Usable directly as a signal receiver."""
+    global _matrix, _generation
+    _generation += 1
+    _matrix = None
@@ -0,0 +1,153 @@
+import csv
+import json
+from itertools import islice
+
+from django.db import transaction
+
+from shop.models import Category, Product
+from shop.serializers import ProductImportSerializer
+from shop.utils.response_cache import bump_generation
+from shop.utils.search import product_index
+
+FORMATS = ("csv", "jsonl")
+MAX_REPORTED_ERRORS = 100
+
+
+def guess_format(filename):
+    if filename.endswith(".csv"):
+        return "csv"
+    if filename.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def read_rows(stream, format):
+    """
+    Yield ``(line number, row dict)`` from a text stream of CSV with a
+    header row or of JSON Lines, one row at a time.
+    """
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif format == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                # Rejected by validation like any other non-object row.
+                row = line
+            yield line_number, row
+    else:
+        raise ValueError(f"Unsupported format {format!r}, expected one of {FORMATS}.")
+
+
+class ProductImporter:
+    """
+    Upserts products by SKU from an iterable of rows, chunk_size rows per
+    transaction: each chunk is validated with ProductImportSerializer, its
+    categories resolved with one query and its products written with one
+    ``INSERT ... ON CONFLICT (sku) DO UPDATE``. Invalid rows are skipped and
+    reported; with ``create_categories`` unknown category names are created
+    instead of rejected.
+    """
+
+    def __init__(self, chunk_size=1000, create_categories=False):
+        self.chunk_size = chunk_size
+        self.create_categories = create_categories
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, rows):
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk)
+        finally:
+            # bulk_create sends no signals.
+            if self.imported:
+                bump_generation(Product)
+                product_index.reset()
+        return self.result()
+
+    def result(self):
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    def validate(self, chunk):
+        serializer = ProductImportSerializer(data=[row for _, row in chunk], many=True)
+        if serializer.is_valid():
+            return [
+                (line_number, data)
+                for (line_number, _), data in zip(chunk, serializer.validated_data)
+            ]
+        valid = []
+        for (line_number, row), errors in zip(chunk, serializer.errors):
+            if errors:
+                self.add_error(line_number, errors)
+            else:
+                valid.append((line_number, serializer.child.run_validation(row)))
+        return valid
+
+    def resolve_categories(self, names):
+        categories = dict(
+            Category.objects.filter(name__in=names).values_list("name", "id")
+        )
+        missing = names - categories.keys()
+        if missing and self.create_categories:
+            Category.objects.bulk_create(
+                [Category(name=name) for name in missing], ignore_conflicts=True
+            )
+            categories.update(
+                Category.objects.filter(name__in=missing).values_list("name", "id")
+            )
+            bump_generation(Category)
+        return categories
+
+    def import_chunk(self, chunk):
+        valid = self.validate(chunk)
+        if not valid:
+            return
+        categories = self.resolve_categories({data["category"] for _, data in valid})
+
+        # A statement may not upsert the same SKU twice; the last row wins.
+        products = {}
+        for line_number, data in valid:
+            category_id = categories.get(data["category"])
+            if category_id is None:
+                self.add_error(line_number, {"category": ["Unknown category."]})
+                continue
+            products[data["sku"]] = Product(
+                sku=data["sku"],
+                name=data["name"],
+                category_id=category_id,
+                price=data["price"],
+            )
+
+        with transaction.atomic():
+            Product.objects.bulk_create(
+                products.values(),
+                update_conflicts=True,
+                unique_fields=["sku"],
+                update_fields=["name", "category", "price", "updated_at"],
+            )
+        self.imported += len(products)
+
+
+def import_products(stream, format, chunk_size=1000, create_categories=False):
+    importer = ProductImporter(chunk_size, create_categories)
+    return importer.run(read_rows(stream, format))
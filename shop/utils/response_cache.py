@@ -0,0 +1,120 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.http import HttpResponse
+
+
+def _get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def response_cache_ttl():
+    return getattr(settings, "RESPONSE_CACHE_TTL", 0)
+
+
+def _generation_key(model):
+    return f"shop:generation:{model._meta.label_lower}"
+
+
+def get_generations(models):
+    """
+    Return the current generation of every model in ``models``.
+
+    A missing counter starts from the current time rather than 1, so a
+    counter that was evicted never repeats a generation that cached
+    responses are still stored under.
+    """
+    cache = _get_cache()
+    keys = [_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model):
+    """Invalidate every cached response that depends on ``model``."""
+    cache = _get_cache()
+    key = _generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def get_table_version(model):
+    """
+    Return ``(max updated_at, row count)`` of ``model``'s table, memoized per
+    model generation for TABLE_VERSION_CACHE_TTL seconds so it is normally
+    only queried again after a save or delete.
+    """
+    ttl = getattr(settings, "TABLE_VERSION_CACHE_TTL", 0)
+    if ttl:
+        (generation,) = get_generations([model])
+        key = f"shop:table_version:{model._meta.label_lower}:{generation}"
+        version = _get_cache().get(key)
+        if version is not None:
+            return version
+    version = model._default_manager.aggregate(
+        last_modified=Max("updated_at"), count=Count("pk")
+    )
+    version = (version["last_modified"], version["count"])
+    if ttl:
+        _get_cache().set(key, version, ttl)
+    return version
+
+
+def make_etag(version, request):
+    """Strong ETag of the response to ``request`` for a table ``version``."""
+    last_modified, count = version
+    raw = "|".join(
+        [
+            last_modified.isoformat() if last_modified else "",
+            str(count),
+            request.accepted_renderer.format,
+            request.path,
+            _sorted_query(request),
+        ]
+    )
+    return '"%s"' % hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _sorted_query(request):
+    return urlencode(sorted(request.GET.lists()), doseq=True)
+
+
+def response_cache_key(view_name, generations, request):
+    raw = "|".join(
+        [
+            view_name,
+            ".".join(str(generation) for generation in generations),
+            request.accepted_renderer.format,
+            request.build_absolute_uri(request.path),
+            _sorted_query(request),
+        ]
+    )
+    return "shop:response:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached_response(key):
+    cached = _get_cache().get(key)
+    if cached is None:
+        return None
+    status, content_type, content = cached
+    return HttpResponse(content, status=status, content_type=content_type)
+
+
+def cache_response(key, response):
+    """Store the rendered body of ``response`` under ``key``."""
+    response.render()
+    _get_cache().set(
+        key,
+        (response.status_code, response["Content-Type"], bytes(response.content)),
+        response_cache_ttl(),
+    )
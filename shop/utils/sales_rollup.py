@@ -0,0 +1,155 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Sum,
+)
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from shop.models import DailyCategorySales, DailyProductSales, OrderItem
+
+ROLLUP_STATUS = "completed"
+
+
+def _increment(model, keys, revenue, units, orders):
+    changes = {
+        "revenue": F("revenue") + revenue,
+        "units": F("units") + units,
+        "orders": F("orders") + orders,
+    }
+    if model.objects.filter(**keys).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(revenue=revenue, units=units, orders=orders, **keys)
+    except IntegrityError:
+        # Created concurrently since the update above.
+        model.objects.filter(**keys).update(**changes)
+
+
+def apply_order(order, sign=1):
+    """
+    Add (``sign=1``) or subtract (``sign=-1``) a completed order's items to
+    or from the daily rollups of the day it was created. Call it in the
+    transaction that moves the order into or out of the completed status.
+
+    Items are credited to their product's current category. Completed
+    orders' items can't change, but once a product has moved to another
+    category, deleting one of its completed orders subtracts from the new
+    category; run rebuild_rollups() to make the category rollups exact
+    again.
+    """
+    apply_order_items(order.pk, order.created_at, sign)
+
+
+def apply_order_items(order_id, created_at, sign=1):
+    """Like apply_order(), for an order known only by id and creation time."""
+    day = timezone.localdate(created_at)
+    products = {}
+    categories = {}
+    items = OrderItem.objects.filter(order_id=order_id).values_list(
+        "product_id", "product__category_id", "quantity", "unit_price", "product__price"
+    )
+    for product_id, category_id, quantity, unit_price, price in items:
+        revenue = (price if unit_price is None else unit_price) * quantity
+        for totals, key in ((products, product_id), (categories, category_id)):
+            total = totals.setdefault(key, [Decimal(0), 0])
+            total[0] += revenue
+            total[1] += quantity
+
+    # Rows are locked in key order, products before categories, so two
+    # orders completed concurrently can't each hold a row the other needs.
+    for product_id, (revenue, units) in sorted(products.items()):
+        _increment(
+            DailyProductSales,
+            {"day": day, "product_id": product_id},
+            sign * revenue,
+            sign * units,
+            sign,
+        )
+    for category_id, (revenue, units) in sorted(categories.items()):
+        _increment(
+            DailyCategorySales,
+            {"day": day, "category_id": category_id},
+            sign * revenue,
+            sign * units,
+            sign,
+        )
+
+
+def _item_revenue():
+    return ExpressionWrapper(
+        Coalesce("unit_price", "product__price") * F("quantity"),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def rebuild_rollups(chunk_size=5000):
+    """Recompute both rollup tables from all completed orders."""
+    completed = OrderItem.objects.filter(order__status=ROLLUP_STATUS).annotate(
+        day=TruncDate("order__created_at")
+    )
+    rollups = [
+        (DailyProductSales, "product_id", "product_id"),
+        (DailyCategorySales, "category_id", "product__category_id"),
+    ]
+    with transaction.atomic():
+        for model, field, source in rollups:
+            model.objects.all().delete()
+            rows = (
+                completed.values("day", source)
+                .annotate(
+                    revenue=Sum(_item_revenue()),
+                    units=Sum("quantity"),
+                    orders=Count("order_id", distinct=True),
+                )
+                .order_by()
+                .iterator(chunk_size=chunk_size)
+            )
+            batch = []
+            for row in rows:
+                batch.append(
+                    model(
+                        day=row["day"],
+                        revenue=row["revenue"],
+                        units=row["units"],
+                        orders=row["orders"],
+                        **{field: row[source]},
+                    )
+                )
+                if len(batch) >= chunk_size:
+                    model.objects.bulk_create(batch)
+                    batch = []
+            model.objects.bulk_create(batch)
+
+
+def daily_revenue(since, until, category=None):
+    """Revenue, units and orders per day and category between two dates."""
+    rows = DailyCategorySales.objects.filter(day__gte=since, day__lte=until)
+    if category is not None:
+        rows = rows.filter(category_id=category)
+    return list(
+        rows.order_by("day", "category_id").values(
+            "day", "category_id", "revenue", "units", "orders"
+        )
+    )
+
+
+def top_products(since, until, limit=10):
+    """The ``limit`` products with the highest revenue between two dates."""
+    return list(
+        DailyProductSales.objects.filter(day__gte=since, day__lte=until)
+        .values("product_id")
+        .annotate(
+            product_name=F("product__name"),
+            revenue=Sum("revenue"),
+            units=Sum("units"),
+            orders=Sum("orders"),
+        )
+        .order_by("-revenue", "product_id")[:limit]
+    )
@@ -0,0 +1,148 @@
+import math
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, router
+
+from shop.models import Product
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Text search configuration of the PostgreSQL backend and its GIN index. The
+# 'simple' configuration only lowercases, like tokenize() below.
+SEARCH_CONFIG = "simple"
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class PostgresSearchBackend:
+    """
+    Full-text search with ``to_tsvector``/``websearch_to_tsquery``, answered
+    from the GIN expression index created by migration 0013.
+    """
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+
+        vector = SearchVector("name", config=SEARCH_CONFIG)
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.alias(document=vector)
+            .filter(document=search_query)
+            .annotate(rank=SearchRank(vector, search_query))
+            .order_by("-rank", "id")
+        )
+
+    def load(self, page):
+        return list(page)
+
+
+class InvertedIndex:
+    """
+    In-process token -> product ids index for databases without full-text
+    search. Built from the Product table on first use, kept current by
+    Product signals and rebuilt every SEARCH_INDEX_REBUILD_INTERVAL seconds
+    to pick up writes made by other processes.
+
+    Like ``websearch_to_tsquery`` for plain words, a product matches only if
+    its name contains every query token. Matches are ranked by the query
+    tokens' frequency in the name weighted by their inverse document
+    frequency.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = None
+        self._tokens = {}
+        self._built_at = None
+
+    def _build(self):
+        self._postings = {}
+        self._tokens = {}
+        for product_id, name in Product.objects.values_list("id", "name").iterator():
+            self._add(product_id, name)
+        self._built_at = time.monotonic()
+
+    def _ensure_built(self):
+        interval = getattr(settings, "SEARCH_INDEX_REBUILD_INTERVAL", 300)
+        if self._postings is None or time.monotonic() - self._built_at >= interval:
+            self._build()
+
+    def _add(self, product_id, name):
+        tokens = Counter(tokenize(name))
+        self._tokens[product_id] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(product_id)
+
+    def _discard(self, product_id):
+        for token in self._tokens.pop(product_id, ()):
+            postings = self._postings[token]
+            postings.discard(product_id)
+            if not postings:
+                del self._postings[token]
+
+    def update(self, product_id, name):
+        with self._lock:
+            if self._postings is not None:
+                self._discard(product_id)
+                self._add(product_id, name)
+
+    def remove(self, product_id):
+        with self._lock:
+            if self._postings is not None:
+                self._discard(product_id)
+
+    def reset(self):
+        with self._lock:
+            self._postings = None
+
+    def search(self, queryset, query):
+        """
+        Return the ids of the products in ``queryset`` that match, best
+        match first.
+        """
+        tokens = set(tokenize(query))
+        with self._lock:
+            self._ensure_built()
+            postings = [self._postings.get(token, set()) for token in tokens]
+            if not postings:
+                return []
+            matches = set.intersection(*postings)
+            total = len(self._tokens) or 1
+            scores = {}
+            for product_id in matches:
+                counts = self._tokens[product_id]
+                scores[product_id] = sum(
+                    math.log(1 + counts[token])
+                    * math.log(1 + total / len(self._postings[token]))
+                    for token in tokens
+                )
+        if matches and queryset.query.has_filters():
+            matches = set(queryset.filter(pk__in=matches).values_list("pk", flat=True))
+        return sorted(matches, key=lambda product_id: (-scores[product_id], product_id))
+
+    def load(self, page):
+        # Ids of products deleted since the index was built are dropped.
+        products = Product.objects.in_bulk(list(page))
+        return [products[product_id] for product_id in page if product_id in products]
+
+
+product_index = InvertedIndex()
+_postgres_backend = PostgresSearchBackend()
+
+
+def get_search_backend():
+    """Pick the search backend matching the database Product is read from."""
+    connection = connections[router.db_for_read(Product)]
+    if connection.vendor == "postgresql":
+        return _postgres_backend
+    return product_index
@@ -1,51 +1,322 @@
+import io
 from rest_framework import viewsets, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from .models import Cart, Product, Category, Order, AccessRule, User, Role
 from shop.permissions import (
     AccessRulePermission,
-    AccessRulePermissionProduct,
-    AccessRulePermissionOrder,
     IsAdminRolePermission,
+    get_effective_rules,
 )
+from shop.utils.permission_matrix import READ_ALL, UPDATE, UPDATE_ALL
 from .serializers import (
+    CartLineSerializer,
     CartSerializer,
     ProductSerializer,
     CategorySerializer,
     OrderSerializer,
     AccessRuleSerializer,
+    SalesReportSerializer,
+    DailyRevenueSerializer,
+    TopProductSerializer,
 )
+from shop.filters import ProductFilterBackend, StableOrderingFilter
+from shop.pagination import (
+    IdCursorPagination,
+    OrderCursorPagination,
+    SearchPagination,
+)
+from toshop.metrics import PermissionTimingMixin
 from users.serializers import UserWithRolesSerializer
 from shop.utils.access_rule_utils import assign_role_to_user, remove_role_from_user
+from shop.utils.order_status import StatusConflict, transition_order
+from shop.utils.search import get_search_backend
+from shop.utils import order_export, sales_rollup
+from shop.utils.product_import import FORMATS, guess_format, import_products
+from shop.utils.response_cache import (
+    cache_response,
+    get_cached_response,
+    get_generations,
+    get_table_version,
+    make_etag,
+    response_cache_key,
+    response_cache_ttl,
+)
+from shop.utils.cart_utils import (
+    add_cart_item,
+    get_cart_id,
+    remove_cart_item,
+    set_cart_item_quantity,
+)
+
+
+class NestedRelationsMixin:
+    """
+    Applies ``select_related_fields`` and ``prefetch_related_fields`` to the
+    queryset of read actions, so nested serializers render a whole page
+    without a query per object.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    nested_relation_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in self.nested_relation_actions:
+            return queryset
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Serves ``cached_actions`` from the response cache for RESPONSE_CACHE_TTL
+    seconds. Entries are keyed by the URL, query parameters and the current
+    generation of every model in ``cache_dependencies``, which signals bump
+    on save and delete. Hits return the stored JSON bytes without querying
+    or serializing; permissions still run first in ``initial()``.
+
+    Only for views whose object permissions don't depend on the object, as
+    cached retrieves skip ``get_object()``.
+    """
+
+    cache_dependencies = ()
+    cached_actions = ("list", "retrieve")
+    _response_cache_key = None
+
+    def get_response_cache_key(self, request):
+        if (
+            not response_cache_ttl()
+            or self.action not in self.cached_actions
+            or request.accepted_renderer.format != "json"
+        ):
+            return None
+        generations = get_generations(self.cache_dependencies or [self.queryset.model])
+        return response_cache_key(
+            f"{self.basename}-{self.action}", generations, request
+        )
+
+    def _cached(self, handler, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is not None:
+            response = get_cached_response(key)
+            if response is not None:
+                return response
+            self._response_cache_key = key
+        return handler(request, *args, **kwargs)
 
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
 
-class CategoryViewSet(viewsets.ModelViewSet):
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._response_cache_key and response.status_code == status.HTTP_200_OK:
+            cache_response(self._response_cache_key, response)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Adds a strong ETag to ``conditional_actions`` responses and answers a
+    matching ``If-None-Match`` with 304 before the main query runs. The
+    ETag is derived from the table's max ``updated_at`` and row count plus
+    the request URL.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    _etag = None
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        if self.action in self.conditional_actions:
+            version = get_table_version(self.queryset.model)
+            self._etag = make_etag(version, request)
+            response = get_conditional_response(request, etag=self._etag)
+            if response is not None:
+                return response
+        return handler(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._etag and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = self._etag
+        return response
+
+
+class CategoryViewSet(
+    PermissionTimingMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AccessRulePermission]
+    pagination_class = IdCursorPagination
+    business_element = "Category"
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(
+    PermissionTimingMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
-    permission_classes = [AccessRulePermissionProduct]
+    permission_classes = [AccessRulePermission]
+    pagination_class = IdCursorPagination
+    filter_backends = [ProductFilterBackend, StableOrderingFilter]
+    ordering_fields = ["price", "name"]
+    ordering = ["id"]
+    cached_actions = ("list", "retrieve", "search")
+    business_element = "Product"
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Products whose name matches ``?q=``, best match first."""
+        return self._cached(self._search, request)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def bulk_import(self, request):
+        """
+        Upsert products by SKU from an uploaded CSV or JSON Lines ``file``.
+        Updating existing products requires the update permission as well.
+        """
+        if not get_effective_rules(request).has(self.business_element, UPDATE):
+            raise PermissionDenied()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "This field is required."})
+        format = request.data.get("format") or guess_format(upload.name)
+        if format not in FORMATS:
+            raise ValidationError({"format": f"Expected one of {', '.join(FORMATS)}."})
+        result = import_products(
+            io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""), format
+        )
+        return Response(result, status=status.HTTP_200_OK)
 
+    def _search(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        backend = get_search_backend()
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(
+            backend.search(self.get_queryset(), query), request, view=self
+        )
+        serializer = self.get_serializer(backend.load(page), many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-class OrderViewSet(viewsets.ModelViewSet):
+
+class OrderViewSet(PermissionTimingMixin, NestedRelationsMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
-    permission_classes = [AccessRulePermissionOrder]
+    prefetch_related_fields = ("items",)
+    permission_classes = [AccessRulePermission]
+    pagination_class = OrderCursorPagination
+    business_element = "Order"
+    owner_field = "user"
+    action_flags = {"process": UPDATE, "complete": UPDATE, "cancel": UPDATE}
 
-    def _hide_get_queryset(self):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Detail routes keep the full queryset so has_object_permission can
+        # answer 403 rather than 404 for other users' orders.
+        if self.action not in ("list", "export"):
+            return queryset
         user = self.request.user
         if not user.is_authenticated:
-            return Order.objects.none()
-        if user.roles.filter(name__in=["admin", "manager"]).exists():
-            return Order.objects.all()
-        return Order.objects.filter(user=user)
+            return queryset.none()
+        if get_effective_rules(self.request).has(self.business_element, READ_ALL):
+            return queryset
+        return queryset.filter(user=user)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Stream the orders visible in the list, with their items, as CSV
+        (``?file_format=csv``, one line per item) or JSON Lines
+        (``?file_format=jsonl``, one line per order).
+        """
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in order_export.FORMATS:
+            raise ValidationError(
+                {"file_format": f"Expected one of {', '.join(order_export.FORMATS)}."}
+            )
+        response = StreamingHttpResponse(
+            order_export.export_orders(self.get_queryset(), file_format),
+            content_type=order_export.CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders.{file_format}"'
+        return response
+
+    def _transition(self, request, pk, name):
+        """
+        Run an Order.TRANSITIONS entry as one conditional UPDATE. Only when
+        it matches no row is the order looked up, to tell a missing order
+        (404) or someone else's (403) from one in the wrong status (409).
+        """
+        try:
+            pk = int(pk)
+        except ValueError:
+            raise NotFound()
+        owned_only = not get_effective_rules(request).has(
+            self.business_element, UPDATE_ALL
+        )
+        user_id = request.user.id if owned_only else None
+        if transition_order(pk, name, user_id=user_id):
+            return Response(
+                {"id": pk, "status": Order.TRANSITIONS[name][1]},
+                status=status.HTTP_200_OK,
+            )
+
+        current = Order.objects.filter(pk=pk).values_list("user_id", "status").first()
+        if current is None:
+            raise NotFound()
+        owner_id, current_status = current
+        if owned_only and owner_id != request.user.id:
+            raise PermissionDenied()
+        raise StatusConflict(name, current_status)
+
+    @action(detail=True, methods=["post"])
+    def process(self, request, pk=None):
+        return self._transition(request, pk, "process")
+
+    @action(detail=True, methods=["post"])
+    def complete(self, request, pk=None):
+        return self._transition(request, pk, "complete")
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        return self._transition(request, pk, "cancel")
 
     def partial_update(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -55,21 +326,93 @@ class OrderViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(PermissionTimingMixin, NestedRelationsMixin, viewsets.ModelViewSet):
     queryset = Cart.objects.all()
     serializer_class = CartSerializer
+    prefetch_related_fields = ("items",)
+
+    def _validated_line(self, request):
+        serializer = CartLineSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @action(detail=False, methods=["post"], url_path="add-item")
+    def add_item(self, request):
+        line = self._validated_line(request)
+        product_id = line["product"].pk
+        quantity = add_cart_item(
+            get_cart_id(request.user), product_id, line["quantity"]
+        )
+        return Response(
+            {"product": product_id, "quantity": quantity}, status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=["post"], url_path="set-quantity")
+    def set_quantity(self, request):
+        line = self._validated_line(request)
+        product_id = line["product"].pk
+        quantity = set_cart_item_quantity(
+            get_cart_id(request.user), product_id, line["quantity"]
+        )
+        return Response(
+            {"product": product_id, "quantity": quantity}, status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=["post"], url_path="remove-item")
+    def remove_item(self, request):
+        product_id = self._validated_line(request)["product"].pk
+        if remove_cart_item(request.user, product_id):
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            {"detail": "Product is not in the cart."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+
+class ReportViewSet(PermissionTimingMixin, viewsets.ViewSet):
+    """
+    Sales reports read from the daily rollup tables, so their cost depends on
+    the requested date range rather than on the order history. Access is
+    granted through AccessRules on the "Report" business element.
+    """
+
+    permission_classes = [AccessRulePermission]
+    business_element = "Report"
+
+    def _params(self, request):
+        serializer = SalesReportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @action(detail=False, methods=["get"], url_path="daily-revenue")
+    def daily_revenue(self, request):
+        params = self._params(request)
+        rows = sales_rollup.daily_revenue(
+            params["since"], params["until"], params.get("category")
+        )
+        return Response(DailyRevenueSerializer(rows, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="top-products")
+    def top_products(self, request):
+        params = self._params(request)
+        rows = sales_rollup.top_products(
+            params["since"], params["until"], params.get("limit", 10)
+        )
+        return Response(TopProductSerializer(rows, many=True).data)
 
 
-class AccessRuleViewSet(viewsets.ModelViewSet):
+class AccessRuleViewSet(PermissionTimingMixin, viewsets.ModelViewSet):
     queryset = AccessRule.objects.all()
     serializer_class = AccessRuleSerializer
     permission_classes = [IsAdminRolePermission]
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(PermissionTimingMixin, NestedRelationsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserWithRolesSerializer
+    prefetch_related_fields = ("roles",)
     permission_classes = [IsAdminRolePermission]
+    pagination_class = IdCursorPagination
 
     @action(detail=True, methods=["post"], url_path="remove-role")
     def remove_role(self, request, pk=None):
@@ -0,0 +1,152 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    """Fixed-bucket histogram; each bucket counts observations <= its bound."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def as_dict(self):
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class RequestMetrics:
+    """Costs collected while serving a single request."""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.permission_time = 0.0
+        self.total_time = 0.0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.query_count += 1
+
+    def server_timing(self):
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries"',
+                f"perm;dur={self.permission_time * 1000:.2f}",
+                f"total;dur={self.total_time * 1000:.2f}",
+            ]
+        )
+
+
+class MetricsRegistry:
+    """Thread-safe per-view histograms of request costs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, metrics):
+        with self._lock:
+            histograms = self._views.get(view_name)
+            if histograms is None:
+                histograms = self._views[view_name] = {
+                    "latency_ms": Histogram(LATENCY_BUCKETS_MS),
+                    "db_ms": Histogram(LATENCY_BUCKETS_MS),
+                    "permission_ms": Histogram(LATENCY_BUCKETS_MS),
+                    "queries": Histogram(QUERY_COUNT_BUCKETS),
+                }
+            histograms["latency_ms"].observe(metrics.total_time * 1000)
+            histograms["db_ms"].observe(metrics.db_time * 1000)
+            histograms["permission_ms"].observe(metrics.permission_time * 1000)
+            histograms["queries"].observe(metrics.query_count)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view_name: {
+                    name: histogram.as_dict() for name, histogram in histograms.items()
+                }
+                for view_name, histograms in sorted(self._views.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def permission_timer(request):
+    """Add the time spent in the block to the request's permission time."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.permission_time += time.perf_counter() - start
+
+
+class PermissionTimingMixin:
+    """Reports the time a view spends in permission checks to the metrics."""
+
+    def check_permissions(self, request):
+        with permission_timer(request):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with permission_timer(request):
+            super().check_object_permissions(request, obj)
+
+
+class QueryMetricsMiddleware:
+    """
+    Records query count, DB time, permission-check time and total latency of
+    every request into the per-view registry. With METRICS_SERVER_TIMING the
+    numbers are also returned in a ``Server-Timing`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics.record_query))
+            response = self.get_response(request)
+        metrics.total_time = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        registry.record(match.view_name if match else "<unresolved>", metrics)
+
+        if getattr(settings, "METRICS_SERVER_TIMING", False):
+            response["Server-Timing"] = metrics.server_timing()
+        return response
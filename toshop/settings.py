@@ -64,6 +64,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "toshop.metrics.QueryMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -142,6 +143,70 @@ REST_FRAMEWORK = {
     ],
 }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Seconds an authenticated user's snapshot (id, email, is_active, role ids) is
+# served from the cache instead of the database. 0 disables the cache.
+USER_CACHE_ALIAS = "default"
+USER_CACHE_TTL = 30
+
+# Embed role ids and the user's auth version in issued JWTs so requests are
+# authorized from the token alone. Role changes, password changes and
+# deactivation bump the version and revoke older tokens. Other processes see a
+# bump once their cached version expires after AUTH_VERSION_CACHE_TTL seconds;
+# keep it at a few seconds unless USER_CACHE_ALIAS is a shared cache.
+JWT_EMBED_ROLES = False
+AUTH_VERSION_CACHE_TTL = 5
+
+# Number of verified JWT payloads each process keeps to skip signature checks
+# for repeated tokens. 0 disables the cache.
+JWT_DECODE_CACHE_SIZE = 10000
+
+# Logged out tokens are kept in the RevokedToken table and mirrored by an
+# in-process bloom filter sized for REVOCATION_FILTER_CAPACITY entries. New
+# revocations from other processes are picked up every
+# REVOCATION_REFRESH_INTERVAL seconds; the filter is rebuilt every
+# REVOCATION_REBUILD_INTERVAL seconds.
+REVOCATION_FILTER_CAPACITY = 100000
+REVOCATION_REFRESH_INTERVAL = 5
+REVOCATION_REBUILD_INTERVAL = 300
+
+# Add a Server-Timing header with DB, permission and total time to every
+# response. Per-view histograms are always available at /api/metrics/.
+METRICS_SERVER_TIMING = DEBUG
+
+# Seconds rendered catalog (category and product) list and detail responses
+# are served from the RESPONSE_CACHE_ALIAS cache. Saving or deleting a
+# category or product invalidates them once the write commits. 0 disables
+# the cache.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TTL = 60
+
+# Catalog responses carry an ETag built from the table's max updated_at and
+# row count, so If-None-Match is answered with 304 before the main query.
+# The pair is memoized per table generation for TABLE_VERSION_CACHE_TTL
+# seconds; 0 recomputes it on every request.
+TABLE_VERSION_CACHE_TTL = 60
+
+# Product search uses PostgreSQL full-text search when available, otherwise an
+# in-process inverted index kept current by signals and rebuilt from the
+# database every SEARCH_INDEX_REBUILD_INTERVAL seconds.
+SEARCH_INDEX_REBUILD_INTERVAL = 300
+
+# Default and maximum page sizes of cursor-paginated API lists. Clients pick a
+# size with ?page_size=, capped at API_MAX_PAGE_SIZE.
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
+# Seconds a process keeps its compiled AccessRule matrix before rebuilding it.
+# Local changes invalidate it immediately via signals; the TTL bounds how long
+# other worker processes may serve stale rules. None disables expiry.
+PERMISSION_MATRIX_TTL = 60
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
@@ -0,0 +1,69 @@
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from shop.models import User, Role, BusinessElement, AccessRule, Category
+from toshop.metrics import Histogram, registry
+
+
+class HistogramTest(SimpleTestCase):
+    def test_observations_fall_into_upper_bound_buckets(self):
+        histogram = Histogram((1, 5))
+        for value in [0.5, 1, 3, 10]:
+            histogram.observe(value)
+        self.assertEqual(
+            histogram.as_dict(),
+            {"count": 4, "sum": 14.5, "buckets": {"1": 2, "5": 1, "+Inf": 1}},
+        )
+
+
+class QueryMetricsMiddlewareTest(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.role_admin = Role.objects.create(name="admin")
+        AccessRule.objects.create(
+            role=self.role_admin,
+            business_element=BusinessElement.objects.create(name="Category"),
+            read_permission=True,
+        )
+        self.admin = User.objects.create_user(
+            email="metrics_admin@example.com", password="adminpass"
+        )
+        self.admin.roles.add(self.role_admin)
+        Category.objects.create(name="Books")
+        self.client.force_authenticate(user=self.admin)
+
+    def test_records_per_view_queries(self):
+        self.client.get(reverse("shop:category-list"))
+        self.client.get(reverse("shop:category-list"))
+
+        view = registry.snapshot()["shop:category-list"]
+        self.assertEqual(view["latency_ms"]["count"], 2)
+        self.assertGreaterEqual(view["queries"]["sum"], 2)
+        self.assertEqual(view["permission_ms"]["count"], 2)
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("shop:category-list"))
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("perm;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_header_disabled(self):
+        response = self.client.get(reverse("shop:category-list"))
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.get(reverse("shop:category-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("shop:category-list", response.data["views"])
+        self.assertIn("hits", response.data["token_cache"])
+
+        user = User.objects.create_user(
+            email="metrics_user@example.com", password="userpass"
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
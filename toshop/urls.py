@@ -1,8 +1,9 @@
 from django.urls import path, include
-from .views import root_view
+from .views import MetricsView, root_view
 
 urlpatterns = [
     path("", root_view, name="root"),
     path("api/users/", include("users.urls")),
     path("api/shop/", include("shop.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
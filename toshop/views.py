@@ -1,5 +1,23 @@
 from django.http import HttpResponse
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from shop.permissions import IsAdminRolePermission
+from toshop.metrics import registry
+from users.utils.token_cache import get_token_cache
 
 
 def root_view(request):
     return HttpResponse("OK")
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminRolePermission]
+
+    def get(self, request):
+        return Response(
+            {"views": registry.snapshot(), "token_cache": get_token_cache().stats()}
+        )
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=204)
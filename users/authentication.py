@@ -1,8 +1,13 @@
 import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import router
 from django.utils.translation import gettext_lazy as _
 from rest_framework import authentication, exceptions, HTTP_HEADER_ENCODING
+from users.utils.auth_version import get_auth_version
+from users.utils.revocation import is_token_revoked
+from users.utils.token_cache import get_token_cache
+from users.utils.user_cache import get_cached_user
 
 User = get_user_model()
 
@@ -48,13 +53,25 @@ class CustomJWTAuthentication(authentication.BaseAuthentication):
 
     def authenticate_credentials(self, jwt_token):
         try:
-            payload = jwt.decode(jwt_token, settings.SECRET_KEY, algorithms=["HS256"])
+            token_cache = get_token_cache()
+            payload = token_cache.get(jwt_token)
+            if payload is None:
+                payload = jwt.decode(
+                    jwt_token, settings.SECRET_KEY, algorithms=["HS256"]
+                )
+                token_cache.set(jwt_token, payload)
             user_id = payload.get("user_id")
 
             if not user_id:
                 raise exceptions.AuthenticationFailed("Invalid token payload.")
 
-            user = User.objects.get(pk=user_id)
+            if is_token_revoked(payload):
+                raise exceptions.AuthenticationFailed("Token revoked.")
+
+            if "ver" in payload:
+                return (self.authenticate_claims(payload), jwt_token)
+
+            user = get_cached_user(user_id)
 
             if not user.is_active:
                 raise exceptions.AuthenticationFailed("User inactive or deleted.")
@@ -68,5 +85,21 @@ class CustomJWTAuthentication(authentication.BaseAuthentication):
         except User.DoesNotExist:
             raise exceptions.AuthenticationFailed("User not found.")
 
+    def authenticate_claims(self, payload):
+        """
+        Build the user from a role-carrying token without touching the
+        users table. The token is only accepted while its auth version
+        matches the user's current one.
+        """
+        user_id = payload["user_id"]
+        if payload["ver"] != get_auth_version(user_id):
+            raise exceptions.AuthenticationFailed("Token revoked.")
+
+        user = User.from_db(
+            router.db_for_read(User), ["id", "is_active"], [user_id, True]
+        )
+        user.cached_role_ids = payload.get("roles", [])
+        return user
+
     def authenticate_header(self, request):
         return self.keyword
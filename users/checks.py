@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Cache backends whose entries are private to one process.
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Longest time a process may serve a stale auth version from a cache the
+# other processes don't see, matching how long a logout takes to reach
+# them through the revocation list.
+MAX_LOCAL_AUTH_VERSION_TTL = 5
+
+
+@register(Tags.security)
+def check_auth_version_cache(app_configs, **kwargs):
+    """
+    With JWT_EMBED_ROLES, a bumped auth version only reaches the process
+    that bumped it unless the cache is shared, so every other process keeps
+    accepting revoked tokens for AUTH_VERSION_CACHE_TTL seconds.
+    """
+    if not getattr(settings, "JWT_EMBED_ROLES", False):
+        return []
+    alias = getattr(settings, "USER_CACHE_ALIAS", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    ttl = getattr(settings, "AUTH_VERSION_CACHE_TTL", MAX_LOCAL_AUTH_VERSION_TTL)
+    if backend in PROCESS_LOCAL_CACHES and ttl > MAX_LOCAL_AUTH_VERSION_TTL:
+        return [
+            Error(
+                f"AUTH_VERSION_CACHE_TTL is {ttl}s on the process-local "
+                f"'{alias}' cache.",
+                hint=(
+                    "Point USER_CACHE_ALIAS at a cache shared by all processes "
+                    f"or lower AUTH_VERSION_CACHE_TTL to at most "
+                    f"{MAX_LOCAL_AUTH_VERSION_TTL} seconds, otherwise revoked "
+                    "tokens stay valid in other processes until it expires."
+                ),
+                id="users.E001",
+            )
+        ]
+    return []
@@ -1,3 +1,8 @@
+from django.conf import settings
+from users.utils.auth_version import ensure_auth_version
+from users.utils.jwt_utils import encode_jwt
+
+
 def soft_delete_user(user):
     """
     Soft delete a user by setting is_active to False.
@@ -6,3 +11,21 @@ def soft_delete_user(user):
     """
     user.is_active = False
     user.save()
+
+
+def issue_token(user):
+    """
+    Issue a JWT for the user. With JWT_EMBED_ROLES enabled the token also
+    carries the user's role ids and current auth version, so requests can be
+    authorized without loading the user.
+    Args:
+        user (User): User the token is issued to.
+    """
+    if not getattr(settings, "JWT_EMBED_ROLES", False):
+        return encode_jwt({"user_id": user.id}, settings.SECRET_KEY)
+    return encode_jwt(
+        {"user_id": user.id},
+        settings.SECRET_KEY,
+        roles=user.roles.values_list("id", flat=True),
+        auth_version=ensure_auth_version(user.id),
+    )
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from shop.models import Role
+from users.utils.auth_version import bump_auth_version, forget_auth_version
+from users.utils.user_cache import invalidate_cached_user, invalidate_cached_users
+
+User = get_user_model()
+
+
+def _roles_changed(user_ids):
+    user_ids = list(user_ids)
+    invalidate_cached_users(user_ids)
+    bump_auth_version(user_ids)
+
+
+@receiver([post_save, post_delete], sender=User)
+def reset_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def reset_auth_version(sender, instance, **kwargs):
+    forget_auth_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_inactive_user_tokens(sender, instance, created, **kwargs):
+    if not created and not instance.is_active:
+        bump_auth_version([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def reset_cached_user_roles(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _roles_changed([instance.pk])
+    elif action in ("post_add", "post_remove"):
+        _roles_changed(pk_set)
+    elif action == "pre_clear":
+        _roles_changed(instance.users.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Role)
+def reset_cached_role_members(sender, instance, **kwargs):
+    # Deleting a role cascades to the user/role rows without m2m_changed.
+    _roles_changed(instance.users.values_list("id", flat=True))
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from users.models import RevokedToken
+from users.utils.jwt_utils import encode_jwt, decode_jwt
+from users.utils.revocation import BloomFilter, is_token_revoked, revocation_list
+
+
+User = get_user_model()
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_added_values_are_members(self):
+        bloom = BloomFilter(capacity=100)
+        values = [f"jti-{i}" for i in range(100)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+        self.assertNotIn("never-added", bloom)
+
+
+class TokenRevocationTests(APITestCase):
+    def setUp(self):
+        revocation_list.reset()
+        self.user = User.objects.create_user(
+            email="revoke@example.com", password="RevokePass123!"
+        )
+        self.token = encode_jwt({"user_id": self.user.id}, settings.SECRET_KEY)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def test_logout_revokes_token(self):
+        response = self.client.post(reverse("users:logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        response = self.client.get(reverse("users:profile-update"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_other_tokens_stay_valid_after_logout(self):
+        self.client.post(reverse("users:logout"))
+        other_token = encode_jwt({"user_id": self.user.id}, settings.SECRET_KEY)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {other_token}")
+        response = self.client.get(reverse("users:profile-update"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unrevoked_token_check_skips_database(self):
+        payload = decode_jwt(self.token, settings.SECRET_KEY)
+        is_token_revoked(payload)
+        with self.assertNumQueries(0):
+            self.assertFalse(is_token_revoked(payload))
+
+
+class PruneRevokedTokensCommandTests(TestCase):
+    def test_prunes_only_expired_tokens(self):
+        now = timezone.now()
+        RevokedToken.objects.create(jti="expired", expires_at=now - timedelta(hours=1))
+        RevokedToken.objects.create(jti="active", expires_at=now + timedelta(hours=1))
+
+        out = StringIO()
+        call_command("prune_revoked_tokens", stdout=out)
+
+        self.assertIn("Pruned 1 revoked tokens.", out.getvalue())
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["active"]
+        )
@@ -0,0 +1,154 @@
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from shop.models import Role, BusinessElement, AccessRule, Category
+from shop.utils.access_rule_utils import assign_role_to_user
+from shop.utils.permission_matrix import get_matrix
+from shop.utils.response_cache import get_table_version
+from users import services
+from users.checks import check_auth_version_cache
+from users.utils.auth_version import get_auth_version
+from users.utils.revocation import revocation_list
+
+
+User = get_user_model()
+
+
+@override_settings(JWT_EMBED_ROLES=True, RESPONSE_CACHE_TTL=0)
+class RoleClaimsTokenTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.password = "ClaimsPass123!"
+        self.user = User.objects.create_user(
+            email="claims@example.com", password=self.password
+        )
+        self.role_user = Role.objects.create(name="user")
+        self.role_manager = Role.objects.create(name="manager")
+        element = BusinessElement.objects.create(name="Category")
+        AccessRule.objects.create(
+            role=self.role_user, business_element=element, read_permission=True
+        )
+        assign_role_to_user(self.user, self.role_user)
+        Category.objects.create(name="Books")
+        self.url = reverse("shop:category-list")
+
+    def _login(self):
+        self.client.credentials()
+        response = self.client.post(
+            reverse("users:login"),
+            {"email": self.user.email, "password": self.password},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['token']}")
+        return response.data["token"]
+
+    def test_login_embeds_roles_and_version(self):
+        token = self._login()
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        self.assertEqual(payload["roles"], [self.role_user.id])
+        self.assertEqual(payload["ver"], get_auth_version(self.user.id))
+
+    @override_settings(REVOCATION_REFRESH_INTERVAL=60)
+    def test_request_is_authorized_from_token(self):
+        self._login()
+        # Fill the process-wide caches a first request would: the permission
+        # matrix, the revocation list (which otherwise refreshes on its first
+        # check) and the category table version behind the ETag.
+        get_matrix()
+        revocation_list.is_revoked("warm-up")
+        get_table_version(Category)
+        # Only the category list itself.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_role_change_revokes_token(self):
+        self._login()
+        assign_role_to_user(self.user, self.role_manager)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self._login()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_change_revokes_token(self):
+        self._login()
+        new_password = "ClaimsPass456!"
+        response = self.client.post(
+            reverse("users:password-change"),
+            {
+                "old_password": self.password,
+                "new_password": new_password,
+                "new_password_confirm": new_password,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(new_password))
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_new_token_after_password_change_is_valid(self):
+        self._login()
+        new_password = "ClaimsPass456!"
+        response = self.client.post(
+            reverse("users:password-change"),
+            {
+                "old_password": self.password,
+                "new_password": new_password,
+                "new_password_confirm": new_password,
+            },
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['token']}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deactivation_revokes_token(self):
+        self._login()
+        services.soft_delete_user(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_token_is_rejected(self):
+        self._login()
+        self.user.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthVersionCacheCheckTests(SimpleTestCase):
+    @override_settings(JWT_EMBED_ROLES=True, AUTH_VERSION_CACHE_TTL=300)
+    def test_long_ttl_on_process_local_cache_fails(self):
+        errors = check_auth_version_cache(None)
+        self.assertEqual([error.id for error in errors], ["users.E001"])
+
+    @override_settings(JWT_EMBED_ROLES=True, AUTH_VERSION_CACHE_TTL=5)
+    def test_short_ttl_passes(self):
+        self.assertEqual(check_auth_version_cache(None), [])
+
+    @override_settings(
+        JWT_EMBED_ROLES=True,
+        AUTH_VERSION_CACHE_TTL=300,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379",
+            }
+        },
+    )
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_auth_version_cache(None), [])
+
+    @override_settings(JWT_EMBED_ROLES=False, AUTH_VERSION_CACHE_TTL=300)
+    def test_ignored_without_embedded_roles(self):
+        self.assertEqual(check_auth_version_cache(None), [])
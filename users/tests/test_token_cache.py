@@ -0,0 +1,74 @@
+import time
+import jwt
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from users.utils.jwt_utils import encode_jwt
+from users.utils.token_cache import TokenCache, get_token_cache
+
+
+User = get_user_model()
+
+
+class TokenCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.cache = TokenCache(maxsize=2)
+        self.exp = time.time() + 60
+
+    def test_hit_and_miss_counters(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", {"user_id": 1, "exp": self.exp})
+        self.assertEqual(self.cache.get("a"), {"user_id": 1, "exp": self.exp})
+        self.assertEqual(
+            self.cache.stats(), {"size": 1, "maxsize": 2, "hits": 1, "misses": 1}
+        )
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.set("a", {"exp": self.exp})
+        self.cache.set("b", {"exp": self.exp})
+        self.cache.get("a")
+        self.cache.set("c", {"exp": self.exp})
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_expired_entry_is_a_miss(self):
+        self.cache.set("a", {"exp": time.time() - 1})
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = TokenCache(maxsize=0)
+        cache.set("a", {"exp": self.exp})
+        self.assertIsNone(cache.get("a"))
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    def setUp(self):
+        get_token_cache().clear()
+        self.user = User.objects.create_user(
+            email="tokencache@example.com", password="TokenPass123!"
+        )
+        token = encode_jwt({"user_id": self.user.id}, settings.SECRET_KEY)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        self.url = reverse("users:profile-update")
+
+    def test_repeated_token_is_decoded_once(self):
+        with mock.patch(
+            "users.authentication.jwt.decode", wraps=jwt.decode
+        ) as decode:
+            self.client.get(self.url)
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(get_token_cache().stats()["hits"], 1)
+
+    def test_tampered_token_is_not_served_from_cache(self):
+        self.client.get(self.url)
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid.token.value")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from shop.models import Role, BusinessElement, AccessRule, Category
+from shop.utils.access_rule_utils import assign_role_to_user, remove_role_from_user
+from shop.utils.permission_matrix import get_matrix
+from users import services
+from users.utils.jwt_utils import encode_jwt
+from users.utils.user_cache import get_cached_user
+
+
+User = get_user_model()
+
+
+@override_settings(USER_CACHE_TTL=30, RESPONSE_CACHE_TTL=0)
+class CachedUserAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.password = "CachedPass123!"
+        self.user = User.objects.create_user(
+            email="cached@example.com", password=self.password, name="Cached User"
+        )
+        self.role_user = Role.objects.create(name="user")
+        element = BusinessElement.objects.create(name="Category")
+        AccessRule.objects.create(
+            role=self.role_user, business_element=element, read_permission=True
+        )
+        Category.objects.create(name="Books")
+        token = encode_jwt({"user_id": self.user.id}, settings.SECRET_KEY)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        self.url = reverse("shop:category-list")
+
+    def test_snapshot_is_served_from_cache(self):
+        get_cached_user(self.user.id)
+        with self.assertNumQueries(0):
+            user = get_cached_user(self.user.id)
+        self.assertEqual(user.email, self.user.email)
+        self.assertEqual(user.cached_role_ids, [])
+
+    def test_warm_request_skips_user_and_roles_queries(self):
+        assign_role_to_user(self.user, self.role_user)
+        self.client.get(self.url)
+        get_matrix()
+        # Only the category list itself.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_role_assignment_invalidates_snapshot(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        assign_role_to_user(self.user, self.role_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        remove_role_from_user(self.user, self.role_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_soft_delete_invalidates_snapshot(self):
+        self.client.get(self.url)
+        services.soft_delete_user(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deferred_fields_load_on_demand(self):
+        get_cached_user(self.user.id)
+        user = get_cached_user(self.user.id)
+        self.assertTrue(user.check_password(self.password))
+        self.assertEqual(user.name, "Cached User")
+
+    def test_profile_update_with_cached_user_keeps_other_fields(self):
+        self.client.get(self.url)
+        response = self.client.patch(
+            reverse("users:profile-update"), {"name": "Renamed"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, "Renamed")
+        self.assertTrue(self.user.check_password(self.password))
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from users.models import AuthVersion
+
+
+def _get_cache():
+    return caches[getattr(settings, "USER_CACHE_ALIAS", "default")]
+
+
+def _cache_key(user_id):
+    return f"users:auth_version:{user_id}"
+
+
+def _cache_ttl():
+    return getattr(settings, "AUTH_VERSION_CACHE_TTL", 5)
+
+
+def _load_version(user_id):
+    version = (
+        AuthVersion.objects.filter(user_id=user_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version
+
+
+def get_auth_version(user_id):
+    """
+    Return the user's current auth version, from the cache when possible,
+    or None if no token carrying a version was ever issued to the user.
+    """
+    cache = _get_cache()
+    version = cache.get(_cache_key(user_id))
+    if version is None:
+        version = _load_version(user_id)
+        if version is not None:
+            # add() so a concurrent bump_auth_version() is never overwritten
+            # with the value read before it.
+            cache.add(_cache_key(user_id), version, _cache_ttl())
+    return version
+
+
+def ensure_auth_version(user_id):
+    """Return the user's auth version, creating the counter if needed."""
+    version = get_auth_version(user_id)
+    if version is None:
+        counter, _ = AuthVersion.objects.get_or_create(user_id=user_id)
+        version = counter.version
+    return version
+
+
+def forget_auth_version(user_id):
+    _get_cache().delete(_cache_key(user_id))
+
+
+def bump_auth_version(user_ids):
+    """
+    Increment the auth version of every user in ``user_ids``, revoking all
+    role-carrying tokens issued to them so far.
+    """
+    cache = _get_cache()
+    for user_id in set(user_ids):
+        updated = AuthVersion.objects.filter(user_id=user_id).update(
+            version=F("version") + 1
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    AuthVersion.objects.create(user_id=user_id, version=1)
+            except IntegrityError:
+                AuthVersion.objects.filter(user_id=user_id).update(
+                    version=F("version") + 1
+                )
+        cache.set(_cache_key(user_id), _load_version(user_id), _cache_ttl())
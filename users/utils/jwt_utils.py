@@ -1,10 +1,18 @@
+import uuid
 import jwt
 from datetime import datetime, timedelta
 
 
-def encode_jwt(data, secret, algorithm="HS256", expire_hours=1):
+def encode_jwt(
+    data, secret, algorithm="HS256", expire_hours=1, roles=None, auth_version=None
+):
     payload = data.copy()
     payload["exp"] = datetime.utcnow() + timedelta(hours=expire_hours)
+    payload.setdefault("jti", uuid.uuid4().hex)
+    if roles is not None:
+        payload["roles"] = list(roles)
+    if auth_version is not None:
+        payload["ver"] = auth_version
     token = jwt.encode(payload, secret, algorithm=algorithm)
     return token
 
@@ -0,0 +1,144 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = max(capacity, 1)
+        self.size = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.sha256(value.encode()).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class RevocationList:
+    """
+    In-process view of the RevokedToken table.
+
+    A bloom filter answers "definitely not revoked" without touching the
+    database; possible positives are confirmed with a single indexed lookup.
+    New rows are pulled incrementally every REVOCATION_REFRESH_INTERVAL
+    seconds. The filter is rebuilt from unexpired rows every
+    REVOCATION_REBUILD_INTERVAL seconds, which drops expired entries and
+    picks up rows committed out of id order, or sooner once it holds more
+    entries than it was sized for.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._last_id = 0
+        self._refreshed_at = None
+        self._built_at = None
+
+    def _capacity(self):
+        return getattr(settings, "REVOCATION_FILTER_CAPACITY", 100000)
+
+    def _rebuild(self):
+        self._last_id = 0
+        rows = self._fetch_new_rows()
+        self._filter = BloomFilter(max(self._capacity(), 2 * len(rows)))
+        self._add_rows(rows)
+        self._built_at = time.monotonic()
+
+    def _fetch_new_rows(self):
+        return list(
+            RevokedToken.objects.filter(
+                id__gt=self._last_id, expires_at__gt=timezone.now()
+            ).values_list("id", "jti")
+        )
+
+    def _load_new_rows(self):
+        self._add_rows(self._fetch_new_rows())
+
+    def _add_rows(self, rows):
+        for row_id, jti in rows:
+            self._filter.add(jti)
+            self._last_id = max(self._last_id, row_id)
+        self._refreshed_at = time.monotonic()
+
+    def _needs_rebuild(self):
+        interval = getattr(settings, "REVOCATION_REBUILD_INTERVAL", 300)
+        return (
+            self._filter is None
+            or self._filter.count > self._filter.capacity
+            or time.monotonic() - self._built_at >= interval
+        )
+
+    def _refresh(self):
+        interval = getattr(settings, "REVOCATION_REFRESH_INTERVAL", 5)
+        with self._lock:
+            if self._needs_rebuild():
+                self._rebuild()
+            elif time.monotonic() - self._refreshed_at >= interval:
+                self._load_new_rows()
+
+    def add(self, jti):
+        self._refresh()
+        with self._lock:
+            self._filter.add(jti)
+
+    def is_revoked(self, jti):
+        self._refresh()
+        if jti not in self._filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+
+revocation_list = RevocationList()
+
+
+def revoke_token(payload):
+    """
+    Revoke the token the payload was decoded from. Tokens issued without a
+    ``jti`` claim cannot be revoked and are ignored.
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return
+    expires_at = datetime.fromtimestamp(payload["exp"], tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    revocation_list.add(jti)
+
+
+def is_token_revoked(payload):
+    jti = payload.get("jti")
+    return bool(jti) and revocation_list.is_revoked(jti)
+
+
+def prune_revoked_tokens():
+    """Delete revocations of tokens that have expired anyway."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
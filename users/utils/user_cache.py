@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import router
+
+User = get_user_model()
+
+SNAPSHOT_FIELDS = ("id", "email", "is_active")
+
+
+def _get_cache():
+    return caches[getattr(settings, "USER_CACHE_ALIAS", "default")]
+
+
+def _cache_key(user_id):
+    return f"users:snapshot:{user_id}"
+
+
+def _snapshot_ttl():
+    return getattr(settings, "USER_CACHE_TTL", 0)
+
+
+def build_snapshot(user):
+    snapshot = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    snapshot["role_ids"] = list(user.roles.values_list("id", flat=True))
+    return snapshot
+
+
+def user_from_snapshot(snapshot):
+    """
+    Build a User from a snapshot. Fields outside SNAPSHOT_FIELDS are deferred
+    and loaded from the database on first access.
+    """
+    user = User.from_db(
+        router.db_for_read(User),
+        list(SNAPSHOT_FIELDS),
+        [snapshot[field] for field in SNAPSHOT_FIELDS],
+    )
+    user.cached_role_ids = snapshot["role_ids"]
+    return user
+
+
+def get_cached_user(user_id):
+    """
+    Return the user with ``user_id`` and its role ids in ``cached_role_ids``,
+    served from the cache when USER_CACHE_TTL is set.
+
+    Raises User.DoesNotExist like ``User.objects.get``.
+    """
+    ttl = _snapshot_ttl()
+    if not ttl:
+        return User.objects.get(pk=user_id)
+
+    cache = _get_cache()
+    snapshot = cache.get(_cache_key(user_id))
+    if snapshot is None:
+        user = User.objects.get(pk=user_id)
+        snapshot = build_snapshot(user)
+        cache.set(_cache_key(user_id), snapshot, ttl)
+        user.cached_role_ids = snapshot["role_ids"]
+        return user
+    return user_from_snapshot(snapshot)
+
+
+def invalidate_cached_user(user_id):
+    _get_cache().delete(_cache_key(user_id))
+
+
+def invalidate_cached_users(user_ids):
+    _get_cache().delete_many([_cache_key(user_id) for user_id in user_ids])
@@ -11,7 +11,10 @@ from .serializers import (
     UserProfileSerializer,
     PasswordChangeSerializer,
 )
-from users.utils.jwt_utils import encode_jwt
+from users.services import issue_token
+from users.utils.auth_version import bump_auth_version
+from users.utils.jwt_utils import decode_jwt
+from users.utils.revocation import revoke_token
 
 
 class RegisterUserView(generics.CreateAPIView):
@@ -35,7 +38,7 @@ class CustomLoginView(APIView):
         )
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
-        token = encode_jwt({"user_id": user.id}, settings.SECRET_KEY)
+        token = issue_token(user)
         return Response({"token": token, "user_id": user.id, "email": user.email})
 
 
@@ -43,6 +46,8 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        if request.auth:
+            revoke_token(decode_jwt(request.auth, settings.SECRET_KEY))
         return Response({"detail": "Successfully logged out."})
 
 
@@ -70,4 +75,7 @@ class PasswordChangeView(APIView):
             )
         user.set_password(serializer.validated_data["new_password"])
         user.save()
-        return Response({"detail": "Password changed successfully."})
+        bump_auth_version([user.pk])
+        return Response(
+            {"detail": "Password changed successfully.", "token": issue_token(user)}
+        )